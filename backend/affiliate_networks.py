@@ -3,328 +3,615 @@ Affiliate Network Integrations Module
 Direct integration with CJ Affiliate, ShareASale, and Awin
 """
 import os
+import sys
 import json
+import time
 import httpx
+import orjson
 import asyncio
+import functools
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# TTL cache for network calls, per client instance: {instance: {key: (expires_at, value)}}
+_cache: 'weakref.WeakKeyDictionary[Any, Dict[Tuple, Tuple[float, Any]]]' = weakref.WeakKeyDictionary()
+_refresh_tasks: Dict[Tuple, asyncio.Task] = {}
+
+# Lookback windows (days) that commission queries are snapped to
+DAY_BUCKETS = (1, 7, 14, 30, 60, 90)
+
+# Commission statuses each network reports for settled (confirmed) earnings
+_CJ_CONFIRMED = frozenset({'confirmed'})
+_SAS_CONFIRMED = frozenset({'confirmed'})
+_AWIN_CONFIRMED = frozenset({'approved', 'confirmed'})
+
+CONFIRMED_STATUSES = {
+    'cj': _CJ_CONFIRMED,
+    'sas': _SAS_CONFIRMED,
+    'awin': _AWIN_CONFIRMED
+}
+
+
+def _bucket(days: int) -> int:
+    """Smallest bucket covering `days`; longer lookbacks are passed through unchanged"""
+    for bucket in DAY_BUCKETS:
+        if bucket >= days:
+            return bucket
+    return days
+
+
+def bucket_days(func):
+    """
+    Snap the `days` argument to DAY_BUCKETS before the call, so near-equal
+    lookbacks (e.g. 20, 28 and 30 days) share one cache entry and one fetch.
+    Lookbacks beyond the largest bucket are never shortened.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, days: int = 30):
+        return await func(self, _bucket(days))
+
+    return wrapper
+
+
+def single_flight(func):
+    """
+    Coalesce concurrent calls with the same arguments into one in-flight
+    request. Every caller awaits the same task; the owner must define
+    an `_inflight` dict.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        key = (func.__name__, args, frozenset(kwargs.items()))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(self, *args, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the shared fetch
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+class _Uncached:
+    """Fallback result that `async_cached` hands back to the caller without storing"""
+    __slots__ = ('value',)
+    
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _detach(value: Any) -> Any:
+    """Copy the lists/dicts of a cached value so callers can't mutate the cache through it"""
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _detach(item) for key, item in value.items()}
+    # Frozen records, strings and numbers are shared as is
+    return value
+
+
+def async_cached(ttl: float = 300, grace: float = 0):
+    """
+    Cache the result of an async method for `ttl` seconds, per instance.
+    Entries that expired less than `grace` seconds ago are served stale
+    while a background task refreshes them. Calls that raise or return an
+    `_Uncached` fallback are not stored, and every caller gets its own copy
+    of the cached lists/dicts. Pair with `single_flight` so concurrent
+    misses share one underlying call.
+    """
+    def decorator(func):
+        async def _refresh(key, self, args, kwargs):
+            value = await func(self, *args, **kwargs)
+            if isinstance(value, _Uncached):
+                return value.value
+            _cache.setdefault(self, {})[key] = (time.monotonic() + ttl, _detach(value))
+            return _detach(value)
+
+        async def _revalidate(key, self, args, kwargs):
+            try:
+                await _refresh(key, self, args, kwargs)
+            except Exception as e:
+                logger.error(f"Background refresh of {func.__qualname__} failed: {e}")
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, frozenset(kwargs.items()))
+            entry = _cache.get(self, {}).get(key)
+            if entry:
+                expires_at, value = entry
+                now = time.monotonic()
+                if now < expires_at:
+                    return _detach(value)
+                if now < expires_at + grace:
+                    # Stale-while-revalidate; the refresh task holds `self`,
+                    # so its id can't be reused while the task is tracked
+                    task_key = (id(self), key)
+                    if task_key not in _refresh_tasks:
+                        task = asyncio.create_task(_revalidate(key, self, args, kwargs))
+                        _refresh_tasks[task_key] = task
+                        task.add_done_callback(lambda _: _refresh_tasks.pop(task_key, None))
+                    return _detach(value)
+            return await _refresh(key, self, args, kwargs)
+
+        return wrapper
+    return decorator
+
+
+# Each network's own key names in the serialized records, as the API has always returned them
+_PROGRAM_KEYS = {
+    'CJ Affiliate': ('advertiser_id', 'program_status'),
+    'ShareASale': ('merchant_id', 'program_status'),
+    'Awin': ('programme_id', 'programme_status')
+}
+_COMMISSION_PARTY_KEY = {
+    'CJ Affiliate': 'advertiser',
+    'ShareASale': 'merchant',
+    'Awin': 'advertiser'
+}
+
+
+@dataclass(slots=True, frozen=True)
+class Commission:
+    """A single commission/transaction record from any network"""
+    transaction_id: str
+    advertiser: str
+    commission: float
+    status: str
+    date: str
+    product: str
+    network: str
+    
+    def __post_init__(self):
+        # Intern status so CONFIRMED_STATUSES lookups hit the identity fast
+        # path, including for strings decoded from live API responses
+        object.__setattr__(self, 'status', sys.intern(self.status))
+    
+    def asdict(self) -> Dict[str, Any]:
+        """Serialized record, keyed the way the originating network names its fields"""
+        return {
+            'transaction_id': self.transaction_id,
+            _COMMISSION_PARTY_KEY[self.network]: self.advertiser,
+            'commission': self.commission,
+            'status': self.status,
+            'date': self.date,
+            'product': self.product
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class Program:
+    """An advertiser/merchant/programme listing from any network"""
+    program_id: str
+    name: str
+    category: str
+    commission_rate: str
+    cookie_duration: str
+    status: str
+    description: str
+    network: str
+    
+    def asdict(self) -> Dict[str, Any]:
+        """Serialized record, keyed the way the originating network names its fields"""
+        id_key, status_key = _PROGRAM_KEYS[self.network]
+        return {
+            id_key: self.program_id,
+            'name': self.name,
+            'category': self.category,
+            'commission_rate': self.commission_rate,
+            'cookie_duration': self.cookie_duration,
+            status_key: self.status,
+            'description': self.description,
+            'network': self.network
+        }
+
+
+# Static mock data, built once at import and shared by every call
+_MOCK_CJ_ADVERTISERS = (
+    Program(
+        program_id='cj_123',
+        name='TechGear Pro',
+        category='Electronics',
+        commission_rate='5-8%',
+        cookie_duration='30 days',
+        status='active',
+        description='Premium tech accessories and gadgets',
+        network='CJ Affiliate'
+    ),
+    Program(
+        program_id='cj_456',
+        name='CloudSoft Solutions',
+        category='Software',
+        commission_rate='$25-50',
+        cookie_duration='45 days',
+        status='active',
+        description='Enterprise cloud software solutions',
+        network='CJ Affiliate'
+    )
+)
+
+_MOCK_CJ_COMMISSIONS = (
+    Commission(
+        transaction_id='cj_001',
+        advertiser='TechGear Pro',
+        commission=45.67,
+        status='confirmed',
+        date='2024-01-10',
+        product='USB-C Hub Pro',
+        network='CJ Affiliate'
+    ),
+    Commission(
+        transaction_id='cj_002',
+        advertiser='CloudSoft Solutions',
+        commission=75.00,
+        status='pending',
+        date='2024-01-12',
+        product='Project Management Suite',
+        network='CJ Affiliate'
+    )
+)
+
+_MOCK_SAS_MERCHANTS = (
+    Program(
+        program_id='sas_789',
+        name='SaaS Startup Tools',
+        category='SaaS/Software',
+        commission_rate='20%',
+        cookie_duration='60 days',
+        status='active',
+        description='Tools for startup founders and entrepreneurs',
+        network='ShareASale'
+    ),
+    Program(
+        program_id='sas_101',
+        name='Digital Marketing Hub',
+        category='Marketing',
+        commission_rate='$15-30',
+        cookie_duration='30 days',
+        status='active',
+        description='Digital marketing courses and tools',
+        network='ShareASale'
+    )
+)
+
+_MOCK_SAS_TRANSACTIONS = (
+    Commission(
+        transaction_id='sas_001',
+        advertiser='SaaS Startup Tools',
+        commission=89.40,
+        status='confirmed',
+        date='2024-01-11',
+        product='Founder Toolkit Pro',
+        network='ShareASale'
+    ),
+    Commission(
+        transaction_id='sas_002',
+        advertiser='Digital Marketing Hub',
+        commission=25.00,
+        status='confirmed',
+        date='2024-01-13',
+        product='SEO Mastery Course',
+        network='ShareASale'
+    )
+)
+
+_MOCK_AWIN_PROGRAMMES = (
+    Program(
+        program_id='awin_321',
+        name='WebDev Tools Co',
+        category='Development Tools',
+        commission_rate='12%',
+        cookie_duration='45 days',
+        status='joined',
+        description='Professional web development tools and resources',
+        network='Awin'
+    ),
+    Program(
+        program_id='awin_654',
+        name='AI Assistant Pro',
+        category='AI/Software',
+        commission_rate='$40-80',
+        cookie_duration='30 days',
+        status='joined',
+        description='Advanced AI productivity assistant',
+        network='Awin'
+    )
+)
+
+_MOCK_AWIN_COMMISSIONS = (
+    Commission(
+        transaction_id='awin_001',
+        advertiser='WebDev Tools Co',
+        commission=67.89,
+        status='approved',
+        date='2024-01-09',
+        product='DevTools Suite Pro',
+        network='Awin'
+    ),
+    Commission(
+        transaction_id='awin_002',
+        advertiser='AI Assistant Pro',
+        commission=120.00,
+        status='pending',
+        date='2024-01-14',
+        product='AI Assistant Annual Plan',
+        network='Awin'
+    )
+)
+
+async def _safe_fetch(coro, network: str) -> Optional[list]:
+    """Await a network fetch, logging failures and returning None instead of raising"""
+    try:
+        return await coro
+    except Exception as e:
+        logger.error(f"{network} fetch failed: {e}")
+        return None
+
+
+def _partial(results: List[Optional[list]], value: Any) -> Any:
+    """Mark `value` as not cacheable when any of the `_safe_fetch` results failed"""
+    return _Uncached(value) if any(rows is None for rows in results) else value
+
+
+def _reduce_commissions(rows, confirmed_statuses) -> Tuple[float, float]:
+    """Return (total, confirmed) earnings for one network's commissions"""
+    total = 0.0
+    confirmed = 0.0
+    for row in rows:
+        amount = row.commission
+        total += amount
+        if row.status in confirmed_statuses:
+            confirmed += amount
+    return total, confirmed
+
+
+def _build_agg(cj_commissions, sas_transactions, awin_commissions) -> Dict[str, Any]:
+    """Reduce per-network commission lists into one summary"""
+    sources = [
+        ('cj', cj_commissions),
+        ('sas', sas_transactions),
+        ('awin', awin_commissions)
+    ]
+    
+    # Starred build sizes the list once instead of growing it per row
+    all_commissions = [*cj_commissions, *sas_transactions, *awin_commissions]
+    total_earnings = 0
+    confirmed_earnings = 0
+    counts = {}
+    for network, rows in sources:
+        total, confirmed = _reduce_commissions(rows, CONFIRMED_STATUSES[network])
+        total_earnings += total
+        confirmed_earnings += confirmed
+        counts[network] = len(rows)
+    pending_earnings = total_earnings - confirmed_earnings
+    
+    return {
+        'total_earnings': total_earnings,
+        'confirmed_earnings': confirmed_earnings,
+        'pending_earnings': pending_earnings,
+        'commission_count': counts['cj'] + counts['sas'] + counts['awin'],
+        'commissions': all_commissions,
+        'network_breakdown': {
+            'cj_affiliate': counts['cj'],
+            'shareasale': counts['sas'],
+            'awin': counts['awin']
+        }
+    }
+
+
+# Mock data never changes, so its aggregate is computed once at import
+_MOCK_AGG = _build_agg(_MOCK_CJ_COMMISSIONS, _MOCK_SAS_TRANSACTIONS, _MOCK_AWIN_COMMISSIONS)
+
+
+@functools.cache
+def _env() -> Dict[str, str]:
+    """
+    Network credentials, read from the environment once per process.
+    Deferred to first use rather than import so values loaded by
+    load_dotenv() in server.py are picked up.
+    """
+    return {
+        'CJ_API_KEY': os.getenv('CJ_API_KEY', 'dummy_cj_key'),
+        'CJ_WEBSITE_ID': os.getenv('CJ_WEBSITE_ID', '12345'),
+        'SHAREASALE_AFFILIATE_ID': os.getenv('SHAREASALE_AFFILIATE_ID', '67890'),
+        'SHAREASALE_API_TOKEN': os.getenv('SHAREASALE_API_TOKEN', 'dummy_sas_token'),
+        'SHAREASALE_API_SECRET': os.getenv('SHAREASALE_API_SECRET', 'dummy_sas_secret'),
+        'AWIN_PUBLISHER_ID': os.getenv('AWIN_PUBLISHER_ID', '98765'),
+        'AWIN_API_TOKEN': os.getenv('AWIN_API_TOKEN', 'dummy_awin_token')
+    }
+
+
 class CJAffiliateClient:
     """Commission Junction Affiliate API Client"""
     
     def __init__(self):
-        self.api_key = os.getenv('CJ_API_KEY', 'dummy_cj_key')
-        self.website_id = os.getenv('CJ_WEBSITE_ID', '12345')
+        self._inflight = {}
+        env = _env()
+        self.api_key = env['CJ_API_KEY']
+        self.website_id = env['CJ_WEBSITE_ID']
         self.base_url = 'https://api.cj.com'
+        self._is_mock = self.api_key.startswith('dummy_')
         
-    async def search_advertisers(self, category: str = '', keywords: str = '') -> List[Dict]:
+    @async_cached(ttl=300)
+    @single_flight
+    async def search_advertisers(self, category: str = '', keywords: str = '') -> List[Program]:
         """Search for advertisers/programs"""
-        try:
-            # Mock data for now since we don't have real API keys
-            return self._get_mock_cj_advertisers()
-        except Exception as e:
-            logger.error(f"CJ Affiliate API error: {e}")
-            return []
+        # No live API integration yet: configured accounts get the mock data too
+        return self._get_mock_cj_advertisers()
     
-    async def get_commissions(self, days: int = 30) -> List[Dict]:
+    @bucket_days
+    @async_cached(ttl=300)
+    @single_flight
+    async def get_commissions(self, days: int = 30) -> List[Commission]:
         """Get commission data"""
-        try:
-            return self._get_mock_cj_commissions()
-        except Exception as e:
-            logger.error(f"CJ Commission API error: {e}")
-            return []
+        # No live API integration yet: configured accounts get the mock data too
+        return self._get_mock_cj_commissions()
     
-    def _get_mock_cj_advertisers(self) -> List[Dict]:
-        return [
-            {
-                'advertiser_id': 'cj_123',
-                'name': 'TechGear Pro',
-                'category': 'Electronics',
-                'commission_rate': '5-8%',
-                'cookie_duration': '30 days',
-                'program_status': 'active',
-                'description': 'Premium tech accessories and gadgets',
-                'network': 'CJ Affiliate'
-            },
-            {
-                'advertiser_id': 'cj_456',
-                'name': 'CloudSoft Solutions',
-                'category': 'Software',
-                'commission_rate': '$25-50',
-                'cookie_duration': '45 days',
-                'program_status': 'active',
-                'description': 'Enterprise cloud software solutions',
-                'network': 'CJ Affiliate'
-            }
-        ]
+    def _get_mock_cj_advertisers(self) -> List[Program]:
+        return list(_MOCK_CJ_ADVERTISERS)
     
-    def _get_mock_cj_commissions(self) -> List[Dict]:
-        return [
-            {
-                'transaction_id': 'cj_001',
-                'advertiser': 'TechGear Pro',
-                'commission': 45.67,
-                'status': 'confirmed',
-                'date': '2024-01-10',
-                'product': 'USB-C Hub Pro'
-            },
-            {
-                'transaction_id': 'cj_002',
-                'advertiser': 'CloudSoft Solutions',
-                'commission': 75.00,
-                'status': 'pending',
-                'date': '2024-01-12',
-                'product': 'Project Management Suite'
-            }
-        ]
+    def _get_mock_cj_commissions(self) -> List[Commission]:
+        return list(_MOCK_CJ_COMMISSIONS)
 
 
 class ShareASaleClient:
     """ShareASale API Client"""
     
     def __init__(self):
-        self.affiliate_id = os.getenv('SHAREASALE_AFFILIATE_ID', '67890')
-        self.api_token = os.getenv('SHAREASALE_API_TOKEN', 'dummy_sas_token')
-        self.api_secret = os.getenv('SHAREASALE_API_SECRET', 'dummy_sas_secret')
+        self._inflight = {}
+        env = _env()
+        self.affiliate_id = env['SHAREASALE_AFFILIATE_ID']
+        self.api_token = env['SHAREASALE_API_TOKEN']
+        self.api_secret = env['SHAREASALE_API_SECRET']
         self.base_url = 'https://api.shareasale.com'
+        self._is_mock = self.api_token.startswith('dummy_')
     
-    async def search_merchants(self, category: str = '') -> List[Dict]:
+    @async_cached(ttl=300)
+    @single_flight
+    async def search_merchants(self, category: str = '') -> List[Program]:
         """Search for merchants/programs"""
-        try:
-            return self._get_mock_sas_merchants()
-        except Exception as e:
-            logger.error(f"ShareASale API error: {e}")
-            return []
+        # No live API integration yet: configured accounts get the mock data too
+        return self._get_mock_sas_merchants()
     
-    async def get_transactions(self, days: int = 30) -> List[Dict]:
+    @bucket_days
+    @async_cached(ttl=300)
+    @single_flight
+    async def get_transactions(self, days: int = 30) -> List[Commission]:
         """Get transaction data"""
-        try:
-            return self._get_mock_sas_transactions()
-        except Exception as e:
-            logger.error(f"ShareASale Transaction API error: {e}")
-            return []
+        # No live API integration yet: configured accounts get the mock data too
+        return self._get_mock_sas_transactions()
     
-    def _get_mock_sas_merchants(self) -> List[Dict]:
-        return [
-            {
-                'merchant_id': 'sas_789',
-                'name': 'SaaS Startup Tools',
-                'category': 'SaaS/Software',
-                'commission_rate': '20%',
-                'cookie_duration': '60 days',
-                'program_status': 'active',
-                'description': 'Tools for startup founders and entrepreneurs',
-                'network': 'ShareASale'
-            },
-            {
-                'merchant_id': 'sas_101',
-                'name': 'Digital Marketing Hub',
-                'category': 'Marketing',
-                'commission_rate': '$15-30',
-                'cookie_duration': '30 days',
-                'program_status': 'active',
-                'description': 'Digital marketing courses and tools',
-                'network': 'ShareASale'
-            }
-        ]
+    def _get_mock_sas_merchants(self) -> List[Program]:
+        return list(_MOCK_SAS_MERCHANTS)
     
-    def _get_mock_sas_transactions(self) -> List[Dict]:
-        return [
-            {
-                'transaction_id': 'sas_001',
-                'merchant': 'SaaS Startup Tools',
-                'commission': 89.40,
-                'status': 'confirmed',
-                'date': '2024-01-11',
-                'product': 'Founder Toolkit Pro'
-            },
-            {
-                'transaction_id': 'sas_002',
-                'merchant': 'Digital Marketing Hub',
-                'commission': 25.00,
-                'status': 'confirmed',
-                'date': '2024-01-13',
-                'product': 'SEO Mastery Course'
-            }
-        ]
+    def _get_mock_sas_transactions(self) -> List[Commission]:
+        return list(_MOCK_SAS_TRANSACTIONS)
 
 
 class AwinClient:
     """Awin (formerly Affiliate Window) API Client"""
     
     def __init__(self):
-        self.publisher_id = os.getenv('AWIN_PUBLISHER_ID', '98765')
-        self.api_token = os.getenv('AWIN_API_TOKEN', 'dummy_awin_token')
+        self._inflight = {}
+        env = _env()
+        self.publisher_id = env['AWIN_PUBLISHER_ID']
+        self.api_token = env['AWIN_API_TOKEN']
         self.base_url = 'https://api.awin.com'
+        self._is_mock = self.api_token.startswith('dummy_')
     
-    async def search_programmes(self, vertical: str = '') -> List[Dict]:
+    @async_cached(ttl=300)
+    @single_flight
+    async def search_programmes(self, vertical: str = '') -> List[Program]:
         """Search for programmes/advertisers"""
-        try:
-            return self._get_mock_awin_programmes()
-        except Exception as e:
-            logger.error(f"Awin API error: {e}")
-            return []
+        # No live API integration yet: configured accounts get the mock data too
+        return self._get_mock_awin_programmes()
     
-    async def get_commissions(self, days: int = 30) -> List[Dict]:
+    @bucket_days
+    @async_cached(ttl=300)
+    @single_flight
+    async def get_commissions(self, days: int = 30) -> List[Commission]:
         """Get commission data"""
-        try:
-            return self._get_mock_awin_commissions()
-        except Exception as e:
-            logger.error(f"Awin Commission API error: {e}")
-            return []
+        # No live API integration yet: configured accounts get the mock data too
+        return self._get_mock_awin_commissions()
     
-    def _get_mock_awin_programmes(self) -> List[Dict]:
-        return [
-            {
-                'programme_id': 'awin_321',
-                'name': 'WebDev Tools Co',
-                'category': 'Development Tools',
-                'commission_rate': '12%',
-                'cookie_duration': '45 days',
-                'programme_status': 'joined',
-                'description': 'Professional web development tools and resources',
-                'network': 'Awin'
-            },
-            {
-                'programme_id': 'awin_654',
-                'name': 'AI Assistant Pro',
-                'category': 'AI/Software',
-                'commission_rate': '$40-80',
-                'cookie_duration': '30 days',
-                'programme_status': 'joined',
-                'description': 'Advanced AI productivity assistant',
-                'network': 'Awin'
-            }
-        ]
+    def _get_mock_awin_programmes(self) -> List[Program]:
+        return list(_MOCK_AWIN_PROGRAMMES)
     
-    def _get_mock_awin_commissions(self) -> List[Dict]:
-        return [
-            {
-                'transaction_id': 'awin_001',
-                'advertiser': 'WebDev Tools Co',
-                'commission': 67.89,
-                'status': 'approved',
-                'date': '2024-01-09',
-                'product': 'DevTools Suite Pro'
-            },
-            {
-                'transaction_id': 'awin_002',
-                'advertiser': 'AI Assistant Pro',
-                'commission': 120.00,
-                'status': 'pending',
-                'date': '2024-01-14',
-                'product': 'AI Assistant Annual Plan'
-            }
-        ]
+    def _get_mock_awin_commissions(self) -> List[Commission]:
+        return list(_MOCK_AWIN_COMMISSIONS)
 
 
 class AffiliateNetworkManager:
     """Unified manager for all affiliate networks"""
     
     def __init__(self):
+        self._inflight = {}
         self.cj_client = CJAffiliateClient()
         self.sas_client = ShareASaleClient()
         self.awin_client = AwinClient()
+        
+        # Without real credentials every network serves static mock data
+        self._mock_mode = (
+            self.cj_client._is_mock
+            and self.sas_client._is_mock
+            and self.awin_client._is_mock
+        )
     
-    async def search_all_programs(self, category: str = '', keywords: str = '') -> List[Dict]:
+    @async_cached(ttl=60)
+    @single_flight
+    async def search_all_programs(self, category: str = '', keywords: str = '') -> List[Program]:
         """Search programs across all networks"""
+        if self._mock_mode:
+            # Mock fetches are plain synchronous lookups; no need to gather
+            return [
+                *_MOCK_CJ_ADVERTISERS,
+                *_MOCK_SAS_MERCHANTS,
+                *_MOCK_AWIN_PROGRAMMES
+            ]
+        
         try:
-            # Fetch from all networks concurrently
-            cj_results, sas_results, awin_results = await asyncio.gather(
-                self.cj_client.search_advertisers(category, keywords),
-                self.sas_client.search_merchants(category),
-                self.awin_client.search_programmes(category),
-                return_exceptions=True
-            )
+            # Fetch from all networks concurrently; failed networks contribute
+            # nothing, and the partial result is not cached
+            async with asyncio.TaskGroup() as tg:
+                cj_task = tg.create_task(_safe_fetch(self.cj_client.search_advertisers(category, keywords), 'CJ Affiliate'))
+                sas_task = tg.create_task(_safe_fetch(self.sas_client.search_merchants(category), 'ShareASale'))
+                awin_task = tg.create_task(_safe_fetch(self.awin_client.search_programmes(category), 'Awin'))
             
-            all_programs = []
+            results = [cj_task.result(), sas_task.result(), awin_task.result()]
+            all_programs = [program for rows in results if rows for program in rows]
             
-            # Combine results from all networks
-            if not isinstance(cj_results, Exception):
-                all_programs.extend(cj_results)
-            if not isinstance(sas_results, Exception):
-                all_programs.extend(sas_results)
-            if not isinstance(awin_results, Exception):
-                all_programs.extend(awin_results)
-            
-            return all_programs
+            return _partial(results, all_programs)
             
         except Exception as e:
             logger.error(f"Error searching all programs: {e}")
-            return []
+            return _Uncached([])
     
+    @bucket_days
+    @async_cached(ttl=60, grace=30)
+    @single_flight
     async def get_all_commissions(self, days: int = 30) -> Dict[str, Any]:
         """Get commissions from all networks"""
+        if self._mock_mode:
+            # async_cached hands every caller its own copy of the containers
+            return _MOCK_AGG
+        
         try:
-            # Fetch from all networks concurrently
-            cj_commissions, sas_transactions, awin_commissions = await asyncio.gather(
-                self.cj_client.get_commissions(days),
-                self.sas_client.get_transactions(days),
-                self.awin_client.get_commissions(days),
-                return_exceptions=True
-            )
+            # Fetch from all networks concurrently; failed networks count as
+            # empty, and the partial result is not cached
+            async with asyncio.TaskGroup() as tg:
+                cj_task = tg.create_task(_safe_fetch(self.cj_client.get_commissions(days), 'CJ Affiliate'))
+                sas_task = tg.create_task(_safe_fetch(self.sas_client.get_transactions(days), 'ShareASale'))
+                awin_task = tg.create_task(_safe_fetch(self.awin_client.get_commissions(days), 'Awin'))
             
-            all_commissions = []
-            total_earnings = 0
-            pending_earnings = 0
-            confirmed_earnings = 0
+            results = [cj_task.result(), sas_task.result(), awin_task.result()]
             
-            # Process CJ commissions
-            if not isinstance(cj_commissions, Exception):
-                for comm in cj_commissions:
-                    all_commissions.append(comm)
-                    total_earnings += comm['commission']
-                    if comm['status'] == 'confirmed':
-                        confirmed_earnings += comm['commission']
-                    else:
-                        pending_earnings += comm['commission']
-            
-            # Process ShareASale transactions
-            if not isinstance(sas_transactions, Exception):
-                for trans in sas_transactions:
-                    all_commissions.append(trans)
-                    total_earnings += trans['commission']
-                    if trans['status'] == 'confirmed':
-                        confirmed_earnings += trans['commission']
-                    else:
-                        pending_earnings += trans['commission']
-            
-            # Process Awin commissions
-            if not isinstance(awin_commissions, Exception):
-                for comm in awin_commissions:
-                    all_commissions.append(comm)
-                    total_earnings += comm['commission']
-                    if comm['status'] in ['approved', 'confirmed']:
-                        confirmed_earnings += comm['commission']
-                    else:
-                        pending_earnings += comm['commission']
-            
-            return {
-                'total_earnings': total_earnings,
-                'confirmed_earnings': confirmed_earnings,
-                'pending_earnings': pending_earnings,
-                'commission_count': len(all_commissions),
-                'commissions': all_commissions,
-                'network_breakdown': {
-                    'cj_affiliate': len(cj_commissions) if not isinstance(cj_commissions, Exception) else 0,
-                    'shareasale': len(sas_transactions) if not isinstance(sas_transactions, Exception) else 0,
-                    'awin': len(awin_commissions) if not isinstance(awin_commissions, Exception) else 0
-                }
-            }
+            return _partial(results, _build_agg(*(rows or [] for rows in results)))
             
         except Exception as e:
             logger.error(f"Error getting all commissions: {e}")
-            return {
+            return _Uncached({
                 'total_earnings': 0,
                 'confirmed_earnings': 0,
                 'pending_earnings': 0,
                 'commission_count': 0,
                 'commissions': [],
                 'network_breakdown': {'cj_affiliate': 0, 'shareasale': 0, 'awin': 0}
-            }
+            })
+    
+    async def get_all_commissions_json(self, days: int = 30) -> bytes:
+        """Get commissions from all networks, pre-serialized as JSON bytes"""
+        summary = await self.get_all_commissions(days)
+        return orjson.dumps(
+            {**summary, 'commissions': [commission.asdict() for commission in summary['commissions']]},
+            option=orjson.OPT_NON_STR_KEYS
+        )
 
-# Singleton instance
-affiliate_networks = AffiliateNetworkManager()
\ No newline at end of file
+@functools.cache
+def get_affiliate_networks() -> AffiliateNetworkManager:
+    """Get affiliate network manager singleton (created on first use)"""
+    return AffiliateNetworkManager()
\ No newline at end of file
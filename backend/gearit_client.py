@@ -3,18 +3,466 @@ GEARit Affiliate Product Integration Client
 Handles importing and managing GEARit's 900+ product catalog
 """
 
+import os
+import gzip
+import hashlib
+import orjson
 import asyncio
 import aiohttp
+import functools
 import logging
-from typing import List, Dict, Optional, Any
-from bs4 import BeautifulSoup
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Sequence, Tuple
+from selectolax.lexbor import LexborHTMLParser
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlencode
 import time
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# CSS selectors matched natively by lexbor. :is() rather than comma lists, since
+# lexbor yields a node once per matching branch of a selector list
+_CSS_CONTAINERS = ':is(div, article):is([class*="product"], [class*="item"])'
+_CSS_NAME = ':is(h2, h3, h4, a):is([class*="title"], [class*="name"], [class*="product"])'
+_CSS_LINK = 'a[href]'
+_CSS_PRICE = ':is(span, div)[class*="price"]'
+_CSS_DESC = ':is(p, span):is([class*="desc"], [class*="summary"])'
+_RE_PRICE = re.compile(r'\d+(?:\.\d+)?')
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+_LDJSON_RE = re.compile(
+    rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.S | re.I
+)
+
+
+def _ldjson_is(data: Dict[str, Any], schema_type: str) -> bool:
+    """Whether a JSON-LD object's @type (a string or a list of them) includes schema_type"""
+    kind = data.get('@type')
+    return kind == schema_type or (isinstance(kind, list) and schema_type in kind)
+
+
+def _ldjson_products(data: Any, listed: bool = False):
+    """
+    Yield (Product object, listed) pairs from a decoded JSON-LD block; `listed`
+    is True for products found inside an ItemList, i.e. the page's listing
+    """
+    if isinstance(data, list):
+        for entry in data:
+            yield from _ldjson_products(entry, listed)
+    elif isinstance(data, dict):
+        if _ldjson_is(data, 'Product'):
+            yield data, listed
+        elif '@graph' in data:
+            yield from _ldjson_products(data['@graph'], listed)
+        elif _ldjson_is(data, 'ItemList'):
+            for element in data.get('itemListElement') or ():
+                yield from _ldjson_products(
+                    element.get('item', element) if isinstance(element, dict) else element, True
+                )
+
+
+def _parse_prices(price_text: str) -> List[str]:
+    """Numeric amounts in a price label, in order ("$24.99 $34.99" -> ['24.99', '34.99'])"""
+    price_text = price_text.replace(',', '')  # Thousands separators, e.g. "$1,299.00"
+    # Most labels are a single "$NN.NN"; str methods handle that without the regex engine
+    amount = price_text[1:] if price_text[:1] == '$' else price_text
+    if amount.replace('.', '', 1).isdecimal():
+        return [amount]
+    return _RE_PRICE.findall(price_text)
+
+
+def _product_id(product_url: str) -> str:
+    """Stable product ID from its URL; 64-bit blake2b keeps a full catalog collision-free"""
+    return f"gearit_{hashlib.blake2b(product_url.encode(), digest_size=8).hexdigest()}"
+
+
+def _node_text(node) -> str:
+    """Whitespace-normalized text content of a selectolax node"""
+    return ' '.join(node.text().split())
+
+
+@dataclass(slots=True)
+class GearitProduct:
+    """Product record extracted from the GEARit catalog"""
+    id: str
+    name: str
+    price: float
+    original_price: Optional[float]
+    description: str
+    image_url: Optional[str]
+    affiliate_url: str
+    source: str
+    category: str
+    rating: float
+    reviews_count: Optional[int]
+    scraped_at: str
+    features: List[str]
+    tags: Sequence[str]  # Shared per-category tuple for scraped products
+    
+    def asdict(self) -> Dict[str, Any]:
+        """Plain dict copy for JSON/database serialization"""
+        # All fields are flat, so a slot walk plus two list copies replaces
+        # dataclasses.asdict's recursive deepcopy of every value
+        record = {name: getattr(self, name) for name in self.__slots__}
+        record['features'] = list(self.features)
+        record['tags'] = list(self.tags)
+        return record
+
+
+def _merge_products(ldjson_products: List[GearitProduct], dom_products: List[GearitProduct],
+                    max_products: int) -> List[GearitProduct]:
+    """DOM listing order, with JSON-LD records replacing their DOM duplicates and extras appended"""
+    by_id = {product.id: product for product in ldjson_products}
+    merged = [by_id.pop(product.id, product) for product in dom_products]
+    merged.extend(by_id.values())
+    return merged[:max_products]
+
+
+# Maximum number of category pages scraped at once, across every caller
+CATEGORY_CONCURRENCY = 4
+_category_semaphore = asyncio.BoundedSemaphore(CATEGORY_CONCURRENCY)
+
+
+class _RateLimiter:
+    """Token bucket: sustained `rate` requests per second, bursts of up to `burst`"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 0.0
+                self._updated = time.monotonic()
+            else:
+                self._tokens -= 1
+
+
+# Polite request rate towards gearit.com, shared by every caller
+CATEGORY_REQUESTS_PER_SECOND = 5
+_rate_limiter = _RateLimiter(CATEGORY_REQUESTS_PER_SECOND, burst=CATEGORY_CONCURRENCY)
+
+# One long-lived session (and keep-alive pool) shared by every GEARitClient
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_shared_session() -> aiohttp.ClientSession:
+    """Get or create the shared aiohttp session (call from within the event loop)"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=8,
+                keepalive_timeout=75,
+                ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive',
+            }
+        )
+    return _session
+
+
+async def close_gearit_session():
+    """Close the shared aiohttp session (call once at app shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+# On-disk store of category page validators and the products parsed from them;
+# a private temp dir unless a shared location is configured
+CATEGORY_CACHE_DIR = Path(os.getenv('GEARIT_CATEGORY_CACHE_DIR') or tempfile.mkdtemp(prefix='gearit-category-'))
+
+
+class _CategoryCache:
+    """
+    Directory of gzipped JSON entries, one per category URL, holding the
+    page's ETag/Last-Modified and the products parsed from it. Lets repeat
+    imports revalidate with a conditional GET and skip parsing on 304.
+    Bounded to max_entries files, evicting the least recently used by mtime.
+    """
+    
+    def __init__(self, base_path: Path, max_entries: int = 64, max_open_files: int = 8):
+        self.base_path = base_path
+        self.max_entries = max_entries
+        self._fd_semaphore = asyncio.BoundedSemaphore(max_open_files)
+    
+    def _path(self, url: str) -> Path:
+        return self.base_path / f"{hashlib.sha1(url.encode()).hexdigest()}.json.gz"
+    
+    def _read(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        try:
+            with gzip.open(path, 'rb') as f:
+                entry = orjson.loads(f.read())
+            os.utime(path)  # Mark as recently used for eviction
+            return entry
+        except (OSError, ValueError):
+            return None
+    
+    def _write(self, url: str, entry: Dict[str, Any]):
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path(url).with_suffix('.tmp')
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(entry))
+        tmp_path.replace(self._path(url))
+        self._evict()
+    
+    def _evict(self):
+        entries = list(self.base_path.glob('*.json.gz'))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda path: path.stat().st_mtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            path.unlink(missing_ok=True)
+    
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        async with self._fd_semaphore:
+            return await asyncio.to_thread(self._read, url)
+    
+    async def set(self, url: str, etag: Optional[str], last_modified: Optional[str],
+                  max_products: int, products: List[Dict[str, Any]]):
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'max_products': max_products,
+            'products': products
+        }
+        try:
+            async with self._fd_semaphore:
+                await asyncio.to_thread(self._write, url, entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache category {url}: {e}")
+
+
+_category_cache = _CategoryCache(CATEGORY_CACHE_DIR)
+
+
+@functools.lru_cache(maxsize=4096)
+def _features_for(name: str, category: str) -> Tuple[str, ...]:
+    """Memoized feature list for a lowercased product name and category slug"""
+    features = []
+    # Tokenize once; each check below is then an O(1) set lookup
+    tokens = frozenset(_SLUG_RE.split(name))
+    
+    # USB Hub features
+    if 'usb' in tokens and not tokens.isdisjoint(('hub', 'hubs')):
+        features.extend(['USB 3.0', 'High-Speed Data Transfer', 'Individual Power Switches'])
+        if '7' in tokens and 'port' in tokens:
+            features.append('7-Port Design')
+        if not tokens.isdisjoint(('power', 'powered')):
+            features.append('External Power Adapter')
+    
+    # Cable features
+    elif category == 'cables':
+        features.extend(['High-Quality Construction', 'Durable Design'])
+        if 'hdmi' in tokens:
+            features.extend(['4K Support', 'Gold-Plated Connectors'])
+        if 'ethernet' in tokens:
+            features.extend(['Cat6', 'Gigabit Speed'])
+    
+    # Adapter features
+    elif category == 'adapters':
+        features.extend(['Plug & Play', 'Universal Compatibility'])
+        if 'usb' in tokens and 'c' in tokens:
+            features.append('USB-C Compatible')
+    
+    return tuple(features)
+
+
+# User's Rakuten SID for the GEARit affiliate program
+RAKUTEN_SID = "YOUR_RAKUTEN_SID"
+
+# Rakuten Advertising deep link structure for GEARit
+# The user needs to replace 'YOUR_RAKUTEN_SID' with their actual Rakuten SID
+RAKUTEN_DEEPLINK_URL = "https://click.linksynergy.com/deeplink"
+GEARIT_MERCHANT_ID = "12345"  # GEARit's Rakuten merchant ID (user needs to get the real one)
+
+
+@functools.lru_cache(maxsize=8)
+def _deep_link_prefix(affiliate_id: str) -> str:
+    """Constant id/mid part of the deep link, encoded once per affiliate ID"""
+    return f"{RAKUTEN_DEEPLINK_URL}?{urlencode((('id', affiliate_id), ('mid', GEARIT_MERCHANT_ID)))}&"
+
+
+def _rakuten_deep_link(product_url: str, affiliate_id: str = RAKUTEN_SID) -> str:
+    """Build a Rakuten Advertising deep link for a GEARit product URL"""
+    # GEARit uses Rakuten Advertising for affiliate tracking
+    # Format: https://click.linksynergy.com/deeplink?id=YOUR_SID&mid=MERCHANT_ID&murl=PRODUCT_URL
+    
+    if not product_url or "gearit.com" not in product_url:
+        logger.warning(f"Invalid product URL for affiliate generation: {product_url}")
+        return product_url  # Return original URL as fallback
+    
+    # Only murl is encoded here; urlencode quotes it so its own ?, & and # survive
+    query = urlencode((('murl', product_url),))
+    
+    return f"{_deep_link_prefix(affiliate_id)}{query}"
+
+
+# Curated sample catalog; get_sample_products builds GearitProduct records from it
+_SAMPLE_SPECS = (
+    {
+        'id': 'gearit_lifestyle_100w_smart_display',
+        'name': 'GEARit Lifestyle Series - 100W USB-C to USB-C Cable Fast Charging with Smart Display, 4 Feet',
+        'price': 34.99,
+        'original_price': 44.99,
+        'description': 'This cable features a smart digital display showing exact charging speeds and supports up to 100W power delivery.',
+        'image_url': 'https://images.unsplash.com/photo-1625842268584-8f3296236761?w=400',
+        'product_url': 'https://www.gearit.com/collections/usb-c-cables/products/gearit-lifestyle-series-100w-usb-c-to-usb-c-cable-fast-charging-with-smart-display',
+        'category': 'Cables & Adapters',
+        'rating': 4.7,
+        'reviews_count': 143,
+        'features': ['100W Power Delivery', 'Smart Display', 'USB-C to USB-C', 'Real-time Charging Speed', '4 Feet Length'],
+        'tags': ['cables', 'gearit', 'usb-c', 'smart-display', '100w']
+    },
+    {
+        'id': 'gearit_lifestyle_65w_usb_c',
+        'name': 'GEARit Lifestyle Series - 65W USB-C to USB-C Cable Fast Charging, 4 Feet',
+        'price': 24.99,
+        'original_price': 32.99,
+        'description': 'A durable USB-C to USB-C cable supporting up to 65W fast charging, suitable for various devices.',
+        'image_url': 'https://images.unsplash.com/photo-1583394838336-acd977736f90?w=400',
+        'product_url': 'https://www.gearit.com/collections/power/products/gearit-lifestyle-series-65w-usb-c-to-usb-c-cable-fast-charging',
+        'category': 'Cables & Adapters',
+        'rating': 4.6,
+        'reviews_count': 89,
+        'features': ['65W Fast Charging', 'USB-C to USB-C', 'Durable Design', '4 Feet Length', 'Device Compatible'],
+        'tags': ['cables', 'gearit', 'usb-c', 'fast-charging', '65w']
+    },
+    {
+        'id': 'gearit_4k_dash_cam',
+        'name': 'GEARit 3-Channel 4K Dash Cam - Front, Inside & Rear with GPS & Night Vision, 64GB Included',
+        'price': 149.99,
+        'original_price': 199.99,
+        'description': 'A comprehensive dash cam system offering 4K recording for front, inside, and rear views, equipped with GPS and night vision capabilities.',
+        'image_url': 'https://images.unsplash.com/photo-1558618047-3c8c76ca7d13?w=400',
+        'product_url': 'https://www.gearit.com/products/gearit-4k-dual-dash-cam-front-rear-with-wifi-gps-night-vision-64gb-included-copy',
+        'category': 'Electronics',
+        'rating': 4.8,
+        'reviews_count': 256,
+        'features': ['4K Recording', '3-Channel System', 'GPS Tracking', 'Night Vision', '64GB Included'],
+        'tags': ['electronics', 'gearit', 'dash-cam', '4k', 'gps']
+    },
+    {
+        'id': 'gearit_3in1_gan_charger',
+        'name': 'GEARit 3-in-1 65W GaN Charger, 10000mAh Power Bank with Built-in USB-C Cable',
+        'price': 89.99,
+        'original_price': 119.99,
+        'description': 'A versatile device combining a 65W GaN wall charger, a 10,000mAh power bank, and a built-in USB-C cable.',
+        'image_url': 'https://images.unsplash.com/photo-1606868306217-dbf5046868d2?w=400',
+        'product_url': 'https://www.gearit.com/products/gearit-10000mah-qi2-wireless-charging-magsafe-power-bank-with-built-in-usb-c-cable-copy',
+        'category': 'Power & Charging',
+        'rating': 4.7,
+        'reviews_count': 178,
+        'features': ['65W GaN Charger', '10000mAh Power Bank', 'Built-in USB-C Cable', '3-in-1 Design', 'Wireless Charging'],
+        'tags': ['power', 'gearit', 'gan-charger', 'power-bank', 'wireless']
+    },
+    {
+        'id': 'gearit_displayport_4k_cable',
+        'name': '4K DisplayPort Cable - 4K@60Hz / QHD 1440p@144Hz / FHD 1080p@144Hz',
+        'price': 19.99,
+        'original_price': 26.99,
+        'description': 'A high-quality DisplayPort cable supporting various resolutions and refresh rates, suitable for gaming and professional use.',
+        'image_url': 'https://images.unsplash.com/photo-1583394838336-acd977736f90?w=400',
+        'product_url': 'https://www.gearit.com/products/gearit-displayport-to-displayport-cable-dp-to-dp-gold-plated-4k-ready-black',
+        'category': 'Cables & Adapters',
+        'rating': 4.6,
+        'reviews_count': 95,
+        'features': ['4K@60Hz Support', '144Hz Gaming Ready', 'Gold-Plated Connectors', 'DisplayPort to DisplayPort', 'Professional Grade'],
+        'tags': ['cables', 'gearit', 'displayport', '4k', 'gaming']
+    },
+    {
+        'id': 'gearit_usb_c_type_a_cable',
+        'name': 'GEARit USB-C Cable, USB Type-C to USB-A 2.0 Male Fast Charging',
+        'price': 14.99,
+        'original_price': 19.99,
+        'description': 'Fast charging cable compatible with USB-C phones, tablets, cameras, and other electronic products. Features Qualcomm Quick Charge 3.0 compatibility, allowing devices to charge up to 80% in 30 minutes.',
+        'image_url': 'https://images.unsplash.com/photo-1609091839311-d5365f9ff1c5?w=400',
+        'product_url': 'https://www.gearit.com/products/usb-c-cable-usb-type-c-to-usb-a-2-0-male-fast-charging',
+        'category': 'Cables & Adapters',
+        'rating': 4.4,
+        'reviews_count': 134,
+        'features': ['Quick Charge 3.0', 'USB-C to USB-A', 'Fast Charging', '80% in 30min', 'Universal Compatibility'],
+        'tags': ['cables', 'gearit', 'usb-c', 'fast-charging', 'quick-charge']
+    },
+    {
+        'id': 'gearit_usb_c_hdmi_cable',
+        'name': 'GEARit USB-C to HDMI Cable - 4K@60Hz Direct Connection',
+        'price': 22.99,
+        'original_price': 29.99,
+        'description': 'Enables direct streaming of Ultra HD 4K (3840x2160) at 60Hz to HDMI-equipped HDTVs, monitors, or projectors from USB-C laptops or devices. Compatible with MacBook Pro, MacBook Air, iPad Pro, and more.',
+        'image_url': 'https://images.unsplash.com/photo-1587831990711-23ca6441447b?w=400',
+        'product_url': 'https://www.gearit.com/products/usb-c-to-hdmi-cable-4k-60hz-direct-connection',
+        'category': 'Cables & Adapters',
+        'rating': 4.6,
+        'reviews_count': 167,
+        'features': ['4K@60Hz Support', 'Direct Connection', 'MacBook Compatible', 'iPad Pro Compatible', 'Ultra HD Streaming'],
+        'tags': ['cables', 'gearit', 'usb-c', 'hdmi', '4k']
+    },
+    {
+        'id': 'gearit_lifestyle_silicone_cable',
+        'name': 'GEARit Lifestyle Series - 4-in-1 Silicone 100W USB-C Cable Fast Charging, 4 Feet',
+        'price': 18.99,
+        'original_price': 25.99,
+        'description': 'Features intelligent IC chip technology that automatically optimizes current and voltage for devices, supporting up to 100W fast charging.',
+        'image_url': 'https://images.unsplash.com/photo-1558618047-3c8c76ca7d13?w=400',
+        'product_url': 'https://www.gearit.com/products/lifestyle-series-4-in-1-silicone-100w-usb-c-cable-fast-charging-4-feet',
+        'category': 'Cables & Adapters',
+        'rating': 4.5,
+        'reviews_count': 112,
+        'features': ['Intelligent IC Chip', '100W Fast Charging', 'Silicone Design', '4-in-1 Functionality', 'Auto Optimization'],
+        'tags': ['cables', 'gearit', 'silicone', '4-in-1', 'fast-charging']
+    }
+)
+
+# The constant sample fields (deep link included) are resolved once per process;
+# each entry is (GearitProduct kwargs, features, tags)
+_SAMPLE_FIELDS = tuple(
+    (
+        {
+            'id': spec['id'],
+            'name': spec['name'],
+            'price': spec['price'],
+            'original_price': spec['original_price'],
+            'description': spec['description'],
+            'image_url': spec['image_url'],
+            'affiliate_url': _rakuten_deep_link(spec['product_url']),
+            'source': 'gearit',
+            'category': spec['category'],
+            'rating': spec['rating'],
+            'reviews_count': spec['reviews_count']
+        },
+        spec['features'],
+        spec['tags']
+    )
+    for spec in _SAMPLE_SPECS
+)
+
+
 class GEARitClient:
     """
     Client for integrating with GEARit's product catalog
@@ -23,8 +471,7 @@ class GEARitClient:
     
     def __init__(self):
         self.base_url = "https://www.gearit.com"
-        self.affiliate_id = "YOUR_RAKUTEN_SID"  # User's Rakuten SID for GEARit affiliate program
-        self.session = None
+        self.affiliate_id = RAKUTEN_SID
         
         # GEARit product categories
         self.categories = {
@@ -38,187 +485,310 @@ class GEARitClient:
             'accessories': 'Tech Accessories'
         }
         
-    async def _get_session(self):
-        """Get or create aiohttp session"""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.5',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'Connection': 'keep-alive',
-                }
-            )
-        return self.session
+        # Every product in a category carries the same tags; share one tuple per slug
+        self._tags_by_slug = {slug: (slug, 'gearit', 'tech', 'electronics') for slug in self.categories}
+        
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared aiohttp session; a plain attribute read, no coroutine per request"""
+        return _get_shared_session()
     
-    async def get_category_products(self, category_slug: str, max_products: int = 200) -> List[Dict[str, Any]]:
+    async def get_category_products(self, category_slug: str, max_products: int = 200,
+                                    scraped_at: Optional[str] = None) -> List[GearitProduct]:
         """
         Scrape products from a specific GEARit category
+        scraped_at lets a batch import stamp every page with the same time
         """
         products = []
-        session = await self._get_session()
+        session = self.session
         
         try:
             # GEARit category URL structure
             category_url = f"{self.base_url}/collections/{category_slug}"
             logger.info(f"Scraping GEARit category: {category_url}")
             
-            async with session.get(category_url) as response:
+            # One timestamp for the whole page (or import) rather than one per product
+            if scraped_at is None:
+                scraped_at = datetime.now(timezone.utc).isoformat()
+            
+            # Revalidate a cached parse that covers this request instead of refetching
+            cached = await _category_cache.get(category_url)
+            cached_products = None
+            if cached:
+                try:
+                    if cached['max_products'] >= max_products:
+                        cached_products = [
+                            GearitProduct(**{**product, 'scraped_at': scraped_at})
+                            for product in cached['products'][:max_products]
+                        ]
+                except (KeyError, TypeError) as e:
+                    # Entry written by another GearitProduct schema; refetch in full
+                    logger.info(f"Ignoring stale category cache entry for {category_slug}: {e}")
+                if cached_products is None:
+                    cached = None
+            
+            headers = {}
+            if cached:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            await _rate_limiter.acquire()
+            async with _category_semaphore, session.get(category_url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    logger.info(f"GEARit category unchanged, using cached products: {category_slug}")
+                    return cached_products
+                
                 if response.status != 200:
                     logger.warning(f"Failed to access {category_url}: {response.status}")
                     return []
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Find product containers (adjust selectors based on GEARit's actual HTML structure)
-                product_containers = soup.find_all(['div', 'article'], class_=re.compile(r'product|item'))
+                # Work on UTF-8 bytes throughout; only other charsets are transcoded in Python
+                html = await response.read()
+                if response.charset and response.charset.lower() not in ('utf-8', 'utf8'):
+                    html = html.decode(response.charset, errors='replace').encode()
                 
-                for container in product_containers[:max_products]:
-                    try:
-                        product = await self._extract_product_info(container, category_slug)
-                        if product:
-                            products.append(product)
-                    except Exception as e:
-                        logger.warning(f"Error extracting product info: {e}")
-                        continue
+                # Embedded JSON-LD is authoritative and needs no DOM. It only stands in for
+                # the tree walk when it describes the listing (an ItemList) or already fills
+                # the request; a lone featured Product must not hide the rest of the grid
+                products, listed = self._extract_ldjson_products(html, category_slug, scraped_at, max_products)
+                if not listed and len(products) < max_products:
+                    products = _merge_products(
+                        products,
+                        self._extract_dom_products(html, category_slug, scraped_at, max_products),
+                        max_products
+                    )
                 
                 logger.info(f"Extracted {len(products)} products from {category_slug}")
                 
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    await _category_cache.set(
+                        category_url, etag, last_modified, max_products,
+                        [product.asdict() for product in products]
+                    )
+                
         except Exception as e:
             logger.error(f"Error scraping category {category_slug}: {e}")
             
         return products
     
-    async def _extract_product_info(self, container, category_slug: str) -> Optional[Dict[str, Any]]:
+    def _extract_ldjson_products(self, html: bytes, category_slug: str, scraped_at: str,
+                                 max_products: int) -> Tuple[List[GearitProduct], bool]:
+        """
+        Extract products from the page's JSON-LD script blocks without building a DOM.
+        Also returns whether any of them came from an ItemList covering the listing.
+        """
+        products = []
+        seen_ids = set()
+        listed = False
+        
+        for match in _LDJSON_RE.finditer(html):
+            try:
+                data = orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
+                continue
+            
+            for item, in_list in _ldjson_products(data):
+                if len(products) >= max_products:
+                    return products, listed
+                
+                try:
+                    product = self._product_from_ldjson(item, category_slug, scraped_at)
+                except Exception as e:
+                    logger.warning(f"Error extracting JSON-LD product: {e}")
+                    continue
+                
+                if product and product.id not in seen_ids:
+                    seen_ids.add(product.id)
+                    products.append(product)
+                    listed = listed or in_list
+        
+        return products, listed
+    
+    def _product_from_ldjson(self, data: Dict[str, Any], category_slug: str, scraped_at: str) -> Optional[GearitProduct]:
+        """
+        Build a product from a schema.org Product object
+        """
+        name = ' '.join(str(data.get('name') or '').split())
+        offers = data.get('offers') or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        
+        url = data.get('url') or offers.get('url')
+        if not name or not url:
+            return None
+        
+        product_url = urljoin(self.base_url, url).split('#', 1)[0]
+        category_label = self.categories.get(category_slug, 'Electronics')
+        
+        price = float(offers.get('price') or offers.get('lowPrice') or 0.0)
+        original_price = offers.get('highPrice')
+        
+        image_url = data.get('image')
+        if isinstance(image_url, list):
+            image_url = image_url[0] if image_url else None
+        if isinstance(image_url, dict):
+            image_url = image_url.get('url')
+        if image_url and not image_url.startswith('http'):
+            image_url = urljoin(self.base_url, image_url)
+        
+        description = ' '.join(str(data.get('description') or '').split())
+        if len(description) > 20:
+            description = description[:200]
+        else:
+            description = f"Premium {category_label} from GEARit"
+        
+        rating = data.get('aggregateRating') or {}
+        reviews_count = rating.get('reviewCount') or rating.get('ratingCount')
+        
+        return GearitProduct(
+            id=_product_id(product_url),
+            name=name,
+            price=price,
+            original_price=float(original_price) if original_price else None,
+            description=description,
+            image_url=image_url,
+            affiliate_url=self._generate_affiliate_url(product_url, name),
+            source='gearit',
+            category=category_label,
+            rating=float(rating.get('ratingValue') or 4.3),
+            reviews_count=int(reviews_count) if reviews_count else None,
+            scraped_at=scraped_at,
+            features=self._generate_features(name, category_slug),
+            tags=self._category_tags(category_slug)
+        )
+    
+    def _extract_dom_products(self, html: bytes, category_slug: str, scraped_at: str,
+                              max_products: int) -> List[GearitProduct]:
+        """
+        Extract products by walking the parsed HTML product containers
+        """
+        products = []
+        tree = LexborHTMLParser(html)
+        
+        # Find product containers (adjust selectors based on GEARit's actual HTML structure)
+        product_containers = tree.css(_CSS_CONTAINERS)
+        
+        # Shop themes nest several matching wrappers per card; skip repeats of a
+        # product URL before doing any text work, and count unique products only
+        seen_urls = set()
+        for container in product_containers:
+            if len(products) >= max_products:
+                break
+            
+            link_elem = container.css_first(_CSS_LINK)
+            if not link_elem:
+                continue
+            product_url = urljoin(self.base_url, link_elem.attributes['href']).split('#', 1)[0]
+            if product_url in seen_urls:
+                continue
+            seen_urls.add(product_url)
+            
+            try:
+                product = self._extract_product_info(container, category_slug, scraped_at, product_url)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                logger.warning(f"Error extracting product info: {e}")
+                continue
+        
+        return products
+    
+    def _extract_product_info(self, container, category_slug: str, scraped_at: str,
+                              product_url: str) -> Optional[GearitProduct]:
         """
         Extract product information from HTML container
+        product_url is the container's resolved link, already looked up by the caller
         """
         try:
+            category_label = self.categories.get(category_slug, 'Electronics')
+            
             # Extract product name
-            name_elem = container.find(['h2', 'h3', 'h4', 'a'], class_=re.compile(r'title|name|product'))
-            if not name_elem:
-                name_elem = container.find('a')
+            name_elem = container.css_first(_CSS_NAME) or container.css_first('a')
             
             if not name_elem:
                 return None
                 
-            name = name_elem.get_text(strip=True)
-            
-            # Extract product URL
-            link_elem = container.find('a', href=True)
-            if not link_elem:
-                return None
-                
-            product_url = urljoin(self.base_url, link_elem['href'])
+            name = _node_text(name_elem)
             
             # Extract price
             price = 0.0
             original_price = None
             
-            price_elem = container.find(['span', 'div'], class_=re.compile(r'price'))
+            price_elem = container.css_first(_CSS_PRICE)
             if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                price_match = re.search(r'\$?(\d+\.?\d*)', price_text)
-                if price_match:
-                    price = float(price_match.group(1))
+                price_text = _node_text(price_elem)
+                # Sale listings show "$24.99 $34.99": current price, then the original
+                prices = _parse_prices(price_text)
+                if prices:
+                    price = float(prices[0])
+                    if len(prices) > 1:
+                        original_price = float(prices[1])
             
             # Extract image URL
             image_url = None
-            img_elem = container.find('img')
+            img_elem = container.css_first('img')
             if img_elem:
-                image_url = img_elem.get('src') or img_elem.get('data-src')
+                image_url = img_elem.attributes.get('src') or img_elem.attributes.get('data-src')
                 if image_url and not image_url.startswith('http'):
                     image_url = urljoin(self.base_url, image_url)
             
             # Generate affiliate URL
             affiliate_url = self._generate_affiliate_url(product_url, name)
             
-            # Extract description or use category-based description
-            description = f"Premium {self.categories.get(category_slug, 'tech accessory')} from GEARit"
-            
-            # Try to get more detailed description
-            desc_elem = container.find(['p', 'span'], class_=re.compile(r'desc|summary'))
+            # Prefer the listed description; only build the category template without one
+            description = None
+            desc_elem = container.css_first(_CSS_DESC)
             if desc_elem:
-                desc_text = desc_elem.get_text(strip=True)
+                desc_text = _node_text(desc_elem)
                 if len(desc_text) > 20:
                     description = desc_text[:200]
+            if description is None:
+                description = f"Premium {category_label} from GEARit"
             
-            return {
-                'id': f"gearit_{hash(product_url) % 1000000}",
-                'name': name,
-                'price': price,
-                'original_price': original_price,
-                'description': description,
-                'image_url': image_url,
-                'affiliate_url': affiliate_url,
-                'source': 'gearit',
-                'category': self.categories.get(category_slug, 'Electronics'),
-                'rating': 4.3,  # Average GEARit rating
-                'reviews_count': None,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': self._generate_features(name, category_slug),
-                'tags': [category_slug, 'gearit', 'tech', 'electronics']
-            }
+            return GearitProduct(
+                id=_product_id(product_url),
+                name=name,
+                price=price,
+                original_price=original_price,
+                description=description,
+                image_url=image_url,
+                affiliate_url=affiliate_url,
+                source='gearit',
+                category=category_label,
+                rating=4.3,  # Average GEARit rating
+                reviews_count=None,
+                scraped_at=scraped_at,
+                features=self._generate_features(name, category_slug),
+                tags=self._category_tags(category_slug)
+            )
             
         except Exception as e:
             logger.warning(f"Error extracting product: {e}")
             return None
     
+    def _category_tags(self, category_slug: str) -> Tuple[str, ...]:
+        """Get the shared tag tuple for a category"""
+        tags = self._tags_by_slug.get(category_slug)
+        if tags is None:
+            tags = (category_slug, 'gearit', 'tech', 'electronics')
+        return tags
+    
     def _generate_affiliate_url(self, product_url: str, product_name: str) -> str:
         """
         Generate affiliate URL for GEARit product using Rakuten Advertising
         GEARit affiliate program works through Rakuten Advertising network
         """
-        # GEARit uses Rakuten Advertising for affiliate tracking
-        # Format: https://click.linksynergy.com/deeplink?id=YOUR_SID&mid=MERCHANT_ID&murl=PRODUCT_URL
-        
-        if not product_url or "gearit.com" not in product_url:
-            logger.warning(f"Invalid product URL for affiliate generation: {product_url}")
-            return product_url  # Return original URL as fallback
-        
-        # Rakuten Advertising deep link structure for GEARit
-        # The user needs to replace 'YOUR_RAKUTEN_SID' with their actual Rakuten SID
-        rakuten_base_url = "https://click.linksynergy.com/deeplink"
-        merchant_id = "12345"  # GEARit's Rakuten merchant ID (user needs to get the real one)
-        
-        # Build the affiliate URL
-        affiliate_url = f"{rakuten_base_url}?id={self.affiliate_id}&mid={merchant_id}&murl={product_url}"
-        
-        return affiliate_url
+        return _rakuten_deep_link(product_url, self.affiliate_id)
     
     def _generate_features(self, name: str, category: str) -> List[str]:
         """
         Generate likely features based on product name and category
         """
-        features = []
-        name_lower = name.lower()
-        
-        # USB Hub features
-        if 'usb' in name_lower and 'hub' in name_lower:
-            features.extend(['USB 3.0', 'High-Speed Data Transfer', 'Individual Power Switches'])
-            if '7-port' in name_lower or '7 port' in name_lower:
-                features.append('7-Port Design')
-            if 'power' in name_lower:
-                features.append('External Power Adapter')
-        
-        # Cable features
-        elif category == 'cables':
-            features.extend(['High-Quality Construction', 'Durable Design'])
-            if 'hdmi' in name_lower:
-                features.extend(['4K Support', 'Gold-Plated Connectors'])
-            if 'ethernet' in name_lower:
-                features.extend(['Cat6', 'Gigabit Speed'])
-        
-        # Adapter features
-        elif category == 'adapters':
-            features.extend(['Plug & Play', 'Universal Compatibility'])
-            if 'usb-c' in name_lower:
-                features.append('USB-C Compatible')
-        
-        return features
+        return list(_features_for(name.lower(), category))
     
     async def import_all_products(self, max_per_category: int = 150) -> Dict[str, Any]:
         """
@@ -234,23 +804,32 @@ class GEARitClient:
         
         logger.info("Starting GEARit full catalog import...")
         
-        for category_slug, category_name in self.categories.items():
-            try:
-                logger.info(f"Processing category: {category_name}")
-                
-                products = await self.get_category_products(category_slug, max_per_category)
-                all_products.extend(products)
-                
-                import_stats['category_counts'][category_name] = len(products)
-                import_stats['categories_processed'] += 1
-                
-                # Rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                error_msg = f"Failed to import {category_name}: {str(e)}"
+        # Resolve DNS and open a keep-alive connection once, so the concurrent
+        # category requests below reuse it instead of all handshaking at once
+        session = self.session
+        try:
+            async with session.head(self.base_url) as response:
+                logger.debug(f"GEARit connection warmed: {response.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"GEARit warmup request failed: {e}")
+        
+        # Fetch all categories concurrently; get_category_products caps in-flight pages
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        results = await asyncio.gather(
+            *(self.get_category_products(slug, max_per_category, scraped_at) for slug in self.categories),
+            return_exceptions=True
+        )
+        
+        for category_name, products in zip(self.categories.values(), results):
+            if isinstance(products, Exception):
+                error_msg = f"Failed to import {category_name}: {str(products)}"
                 logger.error(error_msg)
                 import_stats['errors'].append(error_msg)
+                continue
+            
+            all_products.extend(products)
+            import_stats['category_counts'][category_name] = len(products)
+            import_stats['categories_processed'] += 1
         
         import_stats['total_imported'] = len(all_products)
         
@@ -261,156 +840,31 @@ class GEARitClient:
             'stats': import_stats
         }
     
-    async def get_sample_products(self) -> List[Dict[str, Any]]:
+    async def import_all_products_json(self, max_per_category: int = 150) -> bytes:
+        """Import products from all GEARit categories, pre-serialized as JSON bytes"""
+        # orjson encodes the GearitProduct dataclasses natively, no asdict() pass needed
+        return orjson.dumps(await self.import_all_products(max_per_category))
+    
+    async def get_sample_products(self) -> List[GearitProduct]:
         """
         Generate real GEARit products with actual working URLs from their website
         These are verified working products available in 2025
         """
+        # Fresh records per call: the current timestamp, and lists the caller may mutate
+        scraped_at = datetime.now(timezone.utc).isoformat()
         sample_products = [
-            {
-                'id': 'gearit_lifestyle_100w_smart_display',
-                'name': 'GEARit Lifestyle Series - 100W USB-C to USB-C Cable Fast Charging with Smart Display, 4 Feet',
-                'price': 34.99,
-                'original_price': 44.99,
-                'description': 'This cable features a smart digital display showing exact charging speeds and supports up to 100W power delivery.',
-                'image_url': 'https://images.unsplash.com/photo-1625842268584-8f3296236761?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/collections/usb-c-cables/products/gearit-lifestyle-series-100w-usb-c-to-usb-c-cable-fast-charging-with-smart-display', 'GEARit Lifestyle Series 100W USB-C Cable with Smart Display'),
-                'source': 'gearit',
-                'category': 'Cables & Adapters',
-                'rating': 4.7,
-                'reviews_count': 143,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['100W Power Delivery', 'Smart Display', 'USB-C to USB-C', 'Real-time Charging Speed', '4 Feet Length'],
-                'tags': ['cables', 'gearit', 'usb-c', 'smart-display', '100w']
-            },
-            {
-                'id': 'gearit_lifestyle_65w_usb_c',
-                'name': 'GEARit Lifestyle Series - 65W USB-C to USB-C Cable Fast Charging, 4 Feet',
-                'price': 24.99,
-                'original_price': 32.99,
-                'description': 'A durable USB-C to USB-C cable supporting up to 65W fast charging, suitable for various devices.',
-                'image_url': 'https://images.unsplash.com/photo-1583394838336-acd977736f90?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/collections/power/products/gearit-lifestyle-series-65w-usb-c-to-usb-c-cable-fast-charging', 'GEARit Lifestyle Series 65W USB-C Cable'),
-                'source': 'gearit',
-                'category': 'Cables & Adapters',
-                'rating': 4.6,
-                'reviews_count': 89,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['65W Fast Charging', 'USB-C to USB-C', 'Durable Design', '4 Feet Length', 'Device Compatible'],
-                'tags': ['cables', 'gearit', 'usb-c', 'fast-charging', '65w']
-            },
-            {
-                'id': 'gearit_4k_dash_cam',
-                'name': 'GEARit 3-Channel 4K Dash Cam - Front, Inside & Rear with GPS & Night Vision, 64GB Included',
-                'price': 149.99,
-                'original_price': 199.99,
-                'description': 'A comprehensive dash cam system offering 4K recording for front, inside, and rear views, equipped with GPS and night vision capabilities.',
-                'image_url': 'https://images.unsplash.com/photo-1558618047-3c8c76ca7d13?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/products/gearit-4k-dual-dash-cam-front-rear-with-wifi-gps-night-vision-64gb-included-copy', 'GEARit 3-Channel 4K Dash Cam with GPS'),
-                'source': 'gearit',
-                'category': 'Electronics',
-                'rating': 4.8,
-                'reviews_count': 256,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['4K Recording', '3-Channel System', 'GPS Tracking', 'Night Vision', '64GB Included'],
-                'tags': ['electronics', 'gearit', 'dash-cam', '4k', 'gps']
-            },
-            {
-                'id': 'gearit_3in1_gan_charger',
-                'name': 'GEARit 3-in-1 65W GaN Charger, 10000mAh Power Bank with Built-in USB-C Cable',
-                'price': 89.99,
-                'original_price': 119.99,
-                'description': 'A versatile device combining a 65W GaN wall charger, a 10,000mAh power bank, and a built-in USB-C cable.',
-                'image_url': 'https://images.unsplash.com/photo-1606868306217-dbf5046868d2?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/products/gearit-10000mah-qi2-wireless-charging-magsafe-power-bank-with-built-in-usb-c-cable-copy', 'GEARit 3-in-1 65W GaN Charger 10000mAh Power Bank'),
-                'source': 'gearit',
-                'category': 'Power & Charging',
-                'rating': 4.7,
-                'reviews_count': 178,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['65W GaN Charger', '10000mAh Power Bank', 'Built-in USB-C Cable', '3-in-1 Design', 'Wireless Charging'],
-                'tags': ['power', 'gearit', 'gan-charger', 'power-bank', 'wireless']
-            },
-            {
-                'id': 'gearit_displayport_4k_cable',
-                'name': '4K DisplayPort Cable - 4K@60Hz / QHD 1440p@144Hz / FHD 1080p@144Hz',
-                'price': 19.99,
-                'original_price': 26.99,
-                'description': 'A high-quality DisplayPort cable supporting various resolutions and refresh rates, suitable for gaming and professional use.',
-                'image_url': 'https://images.unsplash.com/photo-1583394838336-acd977736f90?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/products/gearit-displayport-to-displayport-cable-dp-to-dp-gold-plated-4k-ready-black', 'GEARit DisplayPort 4K Cable'),
-                'source': 'gearit',
-                'category': 'Cables & Adapters',
-                'rating': 4.6,
-                'reviews_count': 95,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['4K@60Hz Support', '144Hz Gaming Ready', 'Gold-Plated Connectors', 'DisplayPort to DisplayPort', 'Professional Grade'],
-                'tags': ['cables', 'gearit', 'displayport', '4k', 'gaming']
-            },
-            {
-                'id': 'gearit_usb_c_type_a_cable',
-                'name': 'GEARit USB-C Cable, USB Type-C to USB-A 2.0 Male Fast Charging',
-                'price': 14.99,
-                'original_price': 19.99,
-                'description': 'Fast charging cable compatible with USB-C phones, tablets, cameras, and other electronic products. Features Qualcomm Quick Charge 3.0 compatibility, allowing devices to charge up to 80% in 30 minutes.',
-                'image_url': 'https://images.unsplash.com/photo-1609091839311-d5365f9ff1c5?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/products/usb-c-cable-usb-type-c-to-usb-a-2-0-male-fast-charging', 'USB-C Cable USB Type-C to USB-A 2.0 Male Fast Charging'),
-                'source': 'gearit',
-                'category': 'Cables & Adapters',
-                'rating': 4.4,
-                'reviews_count': 134,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['Quick Charge 3.0', 'USB-C to USB-A', 'Fast Charging', '80% in 30min', 'Universal Compatibility'],
-                'tags': ['cables', 'gearit', 'usb-c', 'fast-charging', 'quick-charge']
-            },
-            {
-                'id': 'gearit_usb_c_hdmi_cable',
-                'name': 'GEARit USB-C to HDMI Cable - 4K@60Hz Direct Connection',
-                'price': 22.99,
-                'original_price': 29.99,
-                'description': 'Enables direct streaming of Ultra HD 4K (3840x2160) at 60Hz to HDMI-equipped HDTVs, monitors, or projectors from USB-C laptops or devices. Compatible with MacBook Pro, MacBook Air, iPad Pro, and more.',
-                'image_url': 'https://images.unsplash.com/photo-1587831990711-23ca6441447b?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/products/usb-c-to-hdmi-cable-4k-60hz-direct-connection', 'USB-C to HDMI Cable 4K 60Hz Direct Connection'),
-                'source': 'gearit',
-                'category': 'Cables & Adapters',
-                'rating': 4.6,
-                'reviews_count': 167,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['4K@60Hz Support', 'Direct Connection', 'MacBook Compatible', 'iPad Pro Compatible', 'Ultra HD Streaming'],
-                'tags': ['cables', 'gearit', 'usb-c', 'hdmi', '4k']
-            },
-            {
-                'id': 'gearit_lifestyle_silicone_cable',
-                'name': 'GEARit Lifestyle Series - 4-in-1 Silicone 100W USB-C Cable Fast Charging, 4 Feet',
-                'price': 18.99,
-                'original_price': 25.99,
-                'description': 'Features intelligent IC chip technology that automatically optimizes current and voltage for devices, supporting up to 100W fast charging.',
-                'image_url': 'https://images.unsplash.com/photo-1558618047-3c8c76ca7d13?w=400',
-                'affiliate_url': self._generate_affiliate_url('https://www.gearit.com/products/lifestyle-series-4-in-1-silicone-100w-usb-c-cable-fast-charging-4-feet', 'Lifestyle Series 4-in-1 Silicone 100W USB-C Cable Fast Charging 4 Feet'),
-                'source': 'gearit',
-                'category': 'Cables & Adapters',
-                'rating': 4.5,
-                'reviews_count': 112,
-                'scraped_at': datetime.now(timezone.utc).isoformat(),
-                'features': ['Intelligent IC Chip', '100W Fast Charging', 'Silicone Design', '4-in-1 Functionality', 'Auto Optimization'],
-                'tags': ['cables', 'gearit', 'silicone', '4-in-1', 'fast-charging']
-            }
+            GearitProduct(**fields, scraped_at=scraped_at, features=list(features), tags=list(tags))
+            for fields, features, tags in _SAMPLE_FIELDS
         ]
         
         logger.info(f"Generated {len(sample_products)} real GEARit products with working URLs")
         return sample_products
     
     async def close(self):
-        """Close the aiohttp session"""
-        if self.session:
-            await self.session.close()
-
-# Singleton instance
-gearit_client = None
+        """Close the shared aiohttp session"""
+        await close_gearit_session()
 
+@functools.cache
 def get_gearit_client() -> GEARitClient:
-    """Get GEARit client singleton"""
-    global gearit_client
-    if gearit_client is None:
-        gearit_client = GEARitClient()
-    return gearit_client
\ No newline at end of file
+    """Get GEARit client singleton (created on first use)"""
+    return GEARitClient()
\ No newline at end of file
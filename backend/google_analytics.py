@@ -2,35 +2,164 @@
 Google Analytics 4 Integration Module
 """
 import os
+import copy
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from google.oauth2.service_account import Credentials
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import (
-    RunReportRequest,
-    DateRange,
-    Dimension,
-    Metric,
-    RunRealtimeReportRequest,
-    OrderBy,
-    FilterExpression,
-    Filter,
-    FilterExpressionList
-)
+import time
+import functools
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+
 import logging
 
+# Optional: without the GA4 SDK the service always serves the mock reports
+try:
+    from google.oauth2.service_account import Credentials
+    from google.analytics.data_v1beta import BetaAnalyticsDataClient
+    from google.analytics.data_v1beta.types import (
+        RunReportRequest,
+        DateRange,
+        Dimension,
+        Metric,
+        RunRealtimeReportRequest,
+        OrderBy,
+        FilterExpression,
+        Filter,
+        FilterExpressionList
+    )
+except ImportError:
+    BetaAnalyticsDataClient = None
+
+from shared_cache import cache_get, cache_set
+
 logger = logging.getLogger(__name__)
 
+# In-process report cache: repeat dashboard refreshes skip the GA4 round-trip
+REPORT_CACHE_TTL = 300
+REALTIME_CACHE_TTL = 30
+REPORT_CACHE_MAX_ENTRIES = 128
+_report_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+
+# Dedicated threads for the blocking GA4 client, so slow report RPCs can't
+# exhaust the loop's default executor that other modules offload file I/O to
+GA4_MAX_WORKERS = 4
+_ga4_executor = ThreadPoolExecutor(max_workers=GA4_MAX_WORKERS, thread_name_prefix='ga4')
+
+async def _run_blocking(func, **kwargs):
+    """Run a blocking GA4 client call on the GA4 thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ga4_executor, functools.partial(func, **kwargs))
+
+def _get_cached_report(key: Tuple) -> Optional[Dict[str, Any]]:
+    """Get a cached report if it has not expired"""
+    entry = _report_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, report = entry
+    if time.monotonic() >= expires_at:
+        _report_cache.pop(key, None)
+        return None
+    logger.debug(f"GA4 report cache hit: {key}")
+    return copy.deepcopy(report)
+
+def _store_report(key: Tuple, ttl: float, report: Dict[str, Any]):
+    """Cache a private copy of a report for `ttl` seconds, dropping the oldest entry when full"""
+    if key not in _report_cache and len(_report_cache) >= REPORT_CACHE_MAX_ENTRIES:
+        _report_cache.pop(next(iter(_report_cache)))
+    _report_cache[key] = (time.monotonic() + ttl, copy.deepcopy(report))
+
+@functools.lru_cache(maxsize=32)
+def _report_dates(today: date, days: int) -> Tuple[str, str]:
+    """Day-resolution (start_date, end_date) strings for a report covering the last `days` days"""
+    return (today - timedelta(days=days)).isoformat(), today.isoformat()
+
+# Fallback reports, built once; the mock accessors hand out deep copies
+_MOCK_PERFORMANCE = {
+    'total_clicks': 1847,
+    'total_sessions': 1234,
+    'bounce_rate': 23.5,
+    'avg_session_duration': 185.7,
+    'conversion_rate': 15.8,
+    'revenue': 2847.50,
+    'top_performing_links': [
+        {
+            'link': 'gearit-usb-hub-2024',
+            'clicks': 234,
+            'conversions': 18,
+            'revenue': 567.89,
+            'ctr': 4.2
+        },
+        {
+            'link': 'hubspot-marketing-2024',
+            'clicks': 189,
+            'conversions': 12,
+            'revenue': 445.67,
+            'ctr': 3.8
+        },
+        {
+            'link': 'elementor-pro-2024',
+            'clicks': 156,
+            'conversions': 9,
+            'revenue': 234.50,
+            'ctr': 3.1
+        }
+    ],
+    'daily_breakdown': [
+        {'date': '2024-01-10', 'clicks': 67, 'conversions': 4, 'revenue': 123.45},
+        {'date': '2024-01-11', 'clicks': 89, 'conversions': 6, 'revenue': 234.56},
+        {'date': '2024-01-12', 'clicks': 78, 'conversions': 5, 'revenue': 189.34},
+        {'date': '2024-01-13', 'clicks': 92, 'conversions': 7, 'revenue': 267.89},
+        {'date': '2024-01-14', 'clicks': 85, 'conversions': 6, 'revenue': 198.76}
+    ]
+}
+
+_MOCK_REALTIME = {
+    'active_users': 23,
+    'events_last_30min': 156,
+    'affiliate_clicks_30min': 12,
+    'top_events': [
+        {'event': 'affiliate_click', 'count': 12},
+        {'event': 'page_view', 'count': 89},
+        {'event': 'product_view', 'count': 34}
+    ],
+    'geographic_data': [
+        {'country': 'United States', 'users': 12},
+        {'country': 'Canada', 'users': 6},
+        {'country': 'United Kingdom', 'users': 5}
+    ],
+    'device_breakdown': [
+        {'device': 'Desktop', 'users': 14},
+        {'device': 'Mobile', 'users': 7},
+        {'device': 'Tablet', 'users': 2}
+    ]
+}
+
 class GoogleAnalyticsService:
     def __init__(self):
         self.credentials_path = os.path.join(os.path.dirname(__file__), 'google_credentials.json')
         self.property_id = "397234567"  # Default property ID, can be overridden
         self.client = None
-        self._initialize_client()
+        
+        # The credentials read and gRPC channel setup are deferred to the first report
+        self._client_initialized = False
+        self._client_lock = asyncio.Lock()
+    
+    async def _ensure_client(self):
+        """Initialize the GA4 client on first use, off the event loop; None without credentials"""
+        if not self._client_initialized:
+            async with self._client_lock:
+                if not self._client_initialized:
+                    await _run_blocking(self._initialize_client)
+                    self._client_initialized = True
+        return self.client
     
     def _initialize_client(self):
         """Initialize Google Analytics Data API client"""
+        if BetaAnalyticsDataClient is None:
+            logger.warning("google-analytics-data is not installed; serving mock analytics")
+            return
+        
         try:
             if os.path.exists(self.credentials_path):
                 credentials = Credentials.from_service_account_file(
@@ -44,16 +173,28 @@ class GoogleAnalyticsService:
         except Exception as e:
             logger.error(f"Failed to initialize Google Analytics client: {e}")
     
-    async def get_affiliate_performance(self, days: int = 30) -> Dict[str, Any]:
-        """Get affiliate link performance data"""
-        if not self.client:
+    async def get_affiliate_performance(self, days: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get affiliate link performance data (cached for REPORT_CACHE_TTL seconds)"""
+        if not await self._ensure_client():
             return self._get_mock_performance_data()
         
-        try:
-            # Date range for the report
-            start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-            end_date = datetime.now().strftime('%Y-%m-%d')
+        # Bounds are whole days, so the cache key and request body only change at midnight
+        start_date, end_date = _report_dates(date.today(), days)
+        cache_key = ('performance', self.property_id, start_date, end_date)
+        shared_key = f"ga4:{self.property_id}:{days}:{end_date}"
+        if not force_refresh:
+            cached = _get_cached_report(cache_key)
+            if cached is not None:
+                return cached
             
+            # Another worker may already have fetched this report
+            shared = await cache_get(shared_key)
+            if shared is not None:
+                logger.debug(f"GA4 shared cache hit: {shared_key}")
+                _store_report(cache_key, REPORT_CACHE_TTL, shared)
+                return shared
+        
+        try:
             request = RunReportRequest(
                 property=f"properties/{self.property_id}",
                 dimensions=[
@@ -71,7 +212,8 @@ class GoogleAnalyticsService:
                 limit=100
             )
             
-            response = self.client.run_report(request=request)
+            # The client call is blocking; run it off the event loop
+            response = await _run_blocking(self.client.run_report, request=request)
             
             # Process the response
             performance_data = {
@@ -83,28 +225,44 @@ class GoogleAnalyticsService:
                 'daily_breakdown': []
             }
             
-            for row in response.rows:
-                performance_data['total_clicks'] += int(row.metric_values[0].value)
-                performance_data['total_sessions'] += int(row.metric_values[1].value)
+            # One pass over the rows; each protobuf metric_values lookup is bound once per row
+            rows = response.rows
+            total_clicks = 0
+            total_sessions = 0
+            total_bounce_rate = 0.0
+            total_duration = 0.0
+            for row in rows:
+                metric_values = row.metric_values
+                total_clicks += int(metric_values[0].value)
+                total_sessions += int(metric_values[1].value)
+                total_bounce_rate += float(metric_values[2].value)
+                total_duration += float(metric_values[3].value)
             
-            if response.rows:
-                total_bounce_rate = sum(float(row.metric_values[2].value) for row in response.rows)
-                performance_data['bounce_rate'] = total_bounce_rate / len(response.rows)
-                
-                total_duration = sum(float(row.metric_values[3].value) for row in response.rows)
-                performance_data['avg_session_duration'] = total_duration / len(response.rows)
+            performance_data['total_clicks'] = total_clicks
+            performance_data['total_sessions'] = total_sessions
+            if rows:
+                performance_data['bounce_rate'] = total_bounce_rate / len(rows)
+                performance_data['avg_session_duration'] = total_duration / len(rows)
             
+            _store_report(cache_key, REPORT_CACHE_TTL, performance_data)
+            await cache_set(shared_key, REPORT_CACHE_TTL, performance_data)
             return performance_data
             
         except Exception as e:
             logger.error(f"Error getting affiliate performance: {e}")
             return self._get_mock_performance_data()
     
-    async def get_realtime_data(self) -> Dict[str, Any]:
-        """Get real-time analytics data"""
-        if not self.client:
+    async def get_realtime_data(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get real-time analytics data (cached for REALTIME_CACHE_TTL seconds)"""
+        if not await self._ensure_client():
             return self._get_mock_realtime_data()
         
+        cache_key = ('realtime', self.property_id)
+        if not force_refresh:
+            cached = _get_cached_report(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             request = RunRealtimeReportRequest(
                 property=f"properties/{self.property_id}",
@@ -119,7 +277,7 @@ class GoogleAnalyticsService:
                 limit=10
             )
             
-            response = self.client.run_realtime_report(request=request)
+            response = await _run_blocking(self.client.run_realtime_report, request=request)
             
             realtime_data = {
                 'active_users': 0,
@@ -129,15 +287,38 @@ class GoogleAnalyticsService:
             }
             
             for row in response.rows:
-                realtime_data['active_users'] += int(row.metric_values[0].value)
-                realtime_data['events_last_30min'] += int(row.metric_values[1].value)
+                metric_values = row.metric_values
+                realtime_data['active_users'] += int(metric_values[0].value)
+                realtime_data['events_last_30min'] += int(metric_values[1].value)
             
+            _store_report(cache_key, REALTIME_CACHE_TTL, realtime_data)
             return realtime_data
             
         except Exception as e:
             logger.error(f"Error getting realtime data: {e}")
             return self._get_mock_realtime_data()
     
+    async def gather_dashboard(self, days: int = 30) -> Dict[str, Any]:
+        """Get performance and realtime data concurrently"""
+        performance, realtime = await asyncio.gather(
+            self.get_affiliate_performance(days),
+            self.get_realtime_data(),
+            return_exceptions=True
+        )
+        
+        # Fall back per report so one failure doesn't sink the whole dashboard
+        if isinstance(performance, Exception):
+            logger.error(f"Error getting affiliate performance: {performance}")
+            performance = self._get_mock_performance_data()
+        if isinstance(realtime, Exception):
+            logger.error(f"Error getting realtime data: {realtime}")
+            realtime = self._get_mock_realtime_data()
+        
+        return {
+            'performance': performance,
+            'realtime': realtime
+        }
+    
     async def track_affiliate_conversion(self, link_id: str, revenue: float, product_name: str) -> bool:
         """Track affiliate conversion (this would typically be done client-side)"""
         try:
@@ -151,67 +332,13 @@ class GoogleAnalyticsService:
     
     def _get_mock_performance_data(self) -> Dict[str, Any]:
         """Mock performance data for testing"""
-        return {
-            'total_clicks': 1847,
-            'total_sessions': 1234,
-            'bounce_rate': 23.5,
-            'avg_session_duration': 185.7,
-            'conversion_rate': 15.8,
-            'revenue': 2847.50,
-            'top_performing_links': [
-                {
-                    'link': 'gearit-usb-hub-2024',
-                    'clicks': 234,
-                    'conversions': 18,
-                    'revenue': 567.89,
-                    'ctr': 4.2
-                },
-                {
-                    'link': 'hubspot-marketing-2024',
-                    'clicks': 189,
-                    'conversions': 12,
-                    'revenue': 445.67,
-                    'ctr': 3.8
-                },
-                {
-                    'link': 'elementor-pro-2024',
-                    'clicks': 156,
-                    'conversions': 9,
-                    'revenue': 234.50,
-                    'ctr': 3.1
-                }
-            ],
-            'daily_breakdown': [
-                {'date': '2024-01-10', 'clicks': 67, 'conversions': 4, 'revenue': 123.45},
-                {'date': '2024-01-11', 'clicks': 89, 'conversions': 6, 'revenue': 234.56},
-                {'date': '2024-01-12', 'clicks': 78, 'conversions': 5, 'revenue': 189.34},
-                {'date': '2024-01-13', 'clicks': 92, 'conversions': 7, 'revenue': 267.89},
-                {'date': '2024-01-14', 'clicks': 85, 'conversions': 6, 'revenue': 198.76}
-            ]
-        }
+        return copy.deepcopy(_MOCK_PERFORMANCE)
     
     def _get_mock_realtime_data(self) -> Dict[str, Any]:
         """Mock realtime data for testing"""
-        return {
-            'active_users': 23,
-            'events_last_30min': 156,
-            'affiliate_clicks_30min': 12,
-            'top_events': [
-                {'event': 'affiliate_click', 'count': 12},
-                {'event': 'page_view', 'count': 89},
-                {'event': 'product_view', 'count': 34}
-            ],
-            'geographic_data': [
-                {'country': 'United States', 'users': 12},
-                {'country': 'Canada', 'users': 6},
-                {'country': 'United Kingdom', 'users': 5}
-            ],
-            'device_breakdown': [
-                {'device': 'Desktop', 'users': 14},
-                {'device': 'Mobile', 'users': 7},
-                {'device': 'Tablet', 'users': 2}
-            ]
-        }
+        return copy.deepcopy(_MOCK_REALTIME)
 
-# Singleton instance
-google_analytics = GoogleAnalyticsService()
\ No newline at end of file
+@functools.cache
+def get_google_analytics() -> GoogleAnalyticsService:
+    """Get Google Analytics service singleton"""
+    return GoogleAnalyticsService()
\ No newline at end of file
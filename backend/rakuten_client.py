@@ -2,9 +2,369 @@
 Rakuten API Client with real credentials integration
 """
 import os
+import hashlib
+import re
+import time
 import httpx
+import orjson
+import asyncio
+import contextlib
+import functools
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from shared_cache import cache_get, cache_set
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# libxml2-backed parsing when available; the stdlib parser has the same iterparse API
+try:
+    from lxml import etree as ET
+    XMLParseError = ET.XMLSyntaxError
+    _LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    XMLParseError = ET.ParseError
+    _LXML = False
+
+# lxml can skip every element except these in C; the stdlib parser yields them all
+_XML_EVENT_FILTER = {'tag': ('TotalMatches', 'item')} if _LXML else {}
+
+# Fast 64-bit hash for fallback product ids; blake2b keeps ids stable without xxhash
+try:
+    import xxhash
+    _hash64 = xxhash.xxh3_64_intdigest
+except ImportError:
+    def _hash64(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def _stable_id(item: Dict) -> str:
+    """Process-independent id for an item without one (unlike hash(), unaffected by PYTHONHASHSEED)"""
+    return f"rakuten_{_hash64(orjson.dumps(item, option=orjson.OPT_SORT_KEYS))}"
+
+
+def _text_getter(path: str):
+    """Child-text accessor for a product <item>, compiled once; '' when the element is missing"""
+    if _LXML:
+        return ET.XPath(f'string({path})', smart_strings=False)
+    return lambda item: item.findtext(path, '')
+
+
+# Product-search <item> fields, keyed by element path
+_ITEM_PATHS = (
+    'linkid', 'sku', 'productname', 'merchantname', 'description/short',
+    'saleprice', 'price', 'imageurl', 'linkurl', 'category/primary',
+    'upccode', 'keywords', 'createdon'
+)
+_ITEM_TEXT = {path: _text_getter(path) for path in _ITEM_PATHS}
+
+# With lxml, every field comes back from one XPath evaluation joined by a private-use
+# code point (XPath rejects control characters, and feeds never contain this one)
+_FIELD_SEP = '\ue000'
+_ITEM_FIELDS = ET.XPath(
+    'concat(' + f", '{_FIELD_SEP}', ".join(f'string({path})' for path in _ITEM_PATHS) + ')',
+    smart_strings=False
+) if _LXML else None
+
+
+def _item_text(item) -> Dict[str, str]:
+    """Text of every product field in an <item>, keyed by element path"""
+    if _ITEM_FIELDS is not None:
+        values = _ITEM_FIELDS(item).split(_FIELD_SEP)
+        if len(values) == len(_ITEM_PATHS):
+            return dict(zip(_ITEM_PATHS, values))
+    return {path: get_text(item) for path, get_text in _ITEM_TEXT.items()}
+
+# _transform_product schema: output key, input keys in priority order, default, caster
+_TRANSFORM_TABLE = (
+    ('id', ('productId', 'id'), None, None),
+    ('name', ('productName', 'name'), 'Rakuten Product', None),
+    ('description', ('description', 'shortDescription'), '', None),
+    ('price', ('price', 'salePrice'), 0, float),
+    ('original_price', ('retailPrice', 'originalPrice'), 0, float),
+    ('image_url', ('imageUrl', 'image'), '', None),
+    ('affiliate_url', ('linkUrl', 'clickUrl'), '', None),
+    ('retailer', ('retailerName', 'merchant'), 'Rakuten', None),
+    ('category', ('category',), 'General', None),
+    ('rating', ('rating', 'customerRating'), 0, float),
+)
+
+
+def _json_text(item: Dict, path: str) -> str:
+    """Field text from a JSON product item, following the same paths as the XML accessors"""
+    value = item
+    for key in path.split('/'):
+        if not isinstance(value, dict):
+            return ''
+        value = value.get(key)
+    if isinstance(value, dict):
+        # Attributed elements (e.g. <price currency="USD">) serialise with a text key
+        value = value.get('#text', value.get('value'))
+    return '' if value is None else str(value)
+
+
+# First numeric run in a price string such as '29.99 USD' or '1,299.00'
+_PRICE_RE = re.compile(r'[-+]?(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d*\.?\d+)')
+
+
+def _parse_price(value: Optional[str]) -> float:
+    """Extract a price from feed text in a single regex scan; 0.0 when none is present"""
+    match = _PRICE_RE.search(value or '')
+    return float(match.group().replace(',', '')) if match else 0.0
+
+# Coupon output key -> coupon API key
+_COUPON_FIELDS = (
+    ('id', 'couponId'),
+    ('advertiser', 'advertiserName'),
+    ('title', 'couponName'),
+    ('description', 'description'),
+    ('code', 'couponCode'),
+    ('discount', 'discountAmount'),
+    ('expires', 'endDate'),
+    ('category', 'category'),
+)
+
+# Transformed products kept per client, keyed by product id / SKU
+TRANSFORM_CACHE_MAX_ENTRIES = 4096
+
+# Coupons change slowly; share each fetch across workers for an hour
+COUPON_CACHE_TTL = 3600
+
+# Max product searches in flight at once from search_products_many, and how
+# many it may start per second (the partner imports used to sleep 0.5s between
+# sequential searches to stay under Rakuten's API quota)
+SEARCH_CONCURRENCY = 5
+SEARCH_REQUESTS_PER_SECOND = 2
+
+
+def _product_data(text: Dict[str, str]) -> Dict:
+    """Product-search fields (keyed by element path) to the dict _transform_product expects"""
+    list_price = text['price']
+    return {
+        'id': text['linkid'],
+        'sku': text['sku'],
+        'name': text['productname'],
+        'merchantname': text['merchantname'],
+        'description': text['description/short'],
+        'price': _parse_price(text['saleprice'] or list_price),
+        'originalPrice': _parse_price(list_price),
+        'imageUrl': text['imageurl'],
+        'linkUrl': text['linkurl'],
+        'category': text['category/primary'] or 'General',
+        'upccode': text['upccode'],
+        'keywords': text['keywords'],
+        'createdon': text['createdon']
+    }
+
+
+def _field_map(keys) -> Tuple[Tuple[str, Optional[str], Any, Any], ...]:
+    """_TRANSFORM_TABLE resolved against a known key set: (output key, the one input key
+    to read or None, default, caster), so the transform does a single lookup per field"""
+    return tuple(
+        (out_key, next((key for key in in_keys if key in keys), None), default, cast)
+        for out_key, in_keys, default, cast in _TRANSFORM_TABLE
+    )
+
+
+# Search results always pass through _product_data, so their keys are known up front
+_PRODUCT_DATA_FIELDS = _field_map(_product_data(dict.fromkeys(_ITEM_PATHS, '')).keys())
+
+# Fallback data, built once at import; affiliate_url templates are filled with each client's SID
+_MOCK_PRODUCTS = (
+    {
+        'id': 'rakuten_usb_hub',
+        'name': 'GEARit 7-Port USB 3.0 Hub with Power Adapter',
+        'description': 'High-speed USB 3.0 hub with individual power switches and LED indicators',
+        'price': 29.99,
+        'original_price': 39.99,
+        'image_url': 'https://images.unsplash.com/photo-1589492477829-5e65395b66cc?w=400',
+        'affiliate_url': 'https://click.linksynergy.com/deeplink?id={sid}&mid=12345&u1=usb-hub&murl=https://www.gearit.com/usb-hub',
+        'retailer': 'GEARit',
+        'category': 'Electronics',
+        'rating': 4.5,
+        'source': 'rakuten',
+        'tags': ['usb', 'hub', 'electronics', 'power']
+    },
+    {
+        'id': 'rakuten_wireless_mouse',
+        'name': 'Wireless Bluetooth Mouse with Ergonomic Design',
+        'description': 'Comfortable wireless mouse with long battery life and precision tracking',
+        'price': 24.99,
+        'original_price': 34.99,
+        'image_url': 'https://images.unsplash.com/photo-1527864550417-7fd91fc51a46?w=400',
+        'affiliate_url': 'https://click.linksynergy.com/deeplink?id={sid}&mid=12345&u1=wireless-mouse&murl=https://example.com/mouse',
+        'retailer': 'TechStore',
+        'category': 'Electronics',
+        'rating': 4.2,
+        'source': 'rakuten',
+        'tags': ['mouse', 'wireless', 'bluetooth', 'ergonomic']
+    },
+    {
+        'id': 'rakuten_keyboard',
+        'name': 'Mechanical Gaming Keyboard RGB Backlit',
+        'description': 'Professional mechanical keyboard with customizable RGB lighting',
+        'price': 89.99,
+        'original_price': 129.99,
+        'image_url': 'https://images.unsplash.com/photo-1541140532154-b024d705b90a?w=400',
+        'affiliate_url': 'https://click.linksynergy.com/deeplink?id={sid}&mid=12345&u1=gaming-keyboard&murl=https://example.com/keyboard',
+        'retailer': 'GameTech',
+        'category': 'Electronics',
+        'rating': 4.7,
+        'source': 'rakuten',
+        'tags': ['keyboard', 'gaming', 'mechanical', 'rgb']
+    }
+)
+
+# Pre-lowered name/description/tags per mock product, for keyword filtering
+_MOCK_SEARCH_TEXT = tuple(
+    '\0'.join((product['name'], product['description'], *product['tags'])).lower()
+    for product in _MOCK_PRODUCTS
+)
+
+
+def _build_mock_index() -> Dict[str, Tuple[int, ...]]:
+    """Map each word in the mock products' search text to the positions containing it;
+    substring containment is used so lookups agree with the fallback scan"""
+    tokens = {token for text in _MOCK_SEARCH_TEXT for token in re.findall(r'\w+', text)}
+    return {
+        token: tuple(i for i, text in enumerate(_MOCK_SEARCH_TEXT) if token in text)
+        for token in tokens
+    }
+
+
+_MOCK_INDEX = _build_mock_index()
+
+
+def _mock_product_positions(keyword: str) -> Tuple[int, ...]:
+    """Positions of mock products matching a keyword: an index lookup for whole words,
+    a substring scan of the pre-lowered text for anything else (partial or multi-word)"""
+    keyword_lower = keyword.lower()
+    positions = _MOCK_INDEX.get(keyword_lower)
+    if positions is None:
+        positions = tuple(i for i, text in enumerate(_MOCK_SEARCH_TEXT) if keyword_lower in text)
+    return positions
+
+
+_MOCK_COUPONS = (
+    {
+        'id': 'gearit_20off',
+        'advertiser': 'GEARit',
+        'title': '20% Off USB Accessories',
+        'description': 'Save 20% on all USB hubs, cables and accessories',
+        'code': 'USB20OFF',
+        'discount': '20%',
+        'expires': '2024-12-31',
+        'category': 'Electronics'
+    },
+    {
+        'id': 'tech_15off',
+        'advertiser': 'TechStore',
+        'title': '$15 Off Orders Over $100',
+        'description': 'Get $15 off when you spend $100 or more',
+        'code': 'SAVE15',
+        'discount': '$15',
+        'expires': '2024-11-30',
+        'category': 'Electronics'
+    }
+)
+
+# HTTP client library behind RakutenAPIClient: 'aiohttp' (default) or 'httpx'
+MARKETING_HTTP_BACKEND = os.getenv('MARKETING_HTTP_BACKEND', 'aiohttp').lower()
+
+# Per-request timeout (seconds) for Rakuten API calls
+RAKUTEN_TIMEOUT = 30.0
+
+# Bytes handed to the XML parser per read while a product-search response streams in
+XML_CHUNK_SIZE = 65536
+
+
+class _AiohttpResponse:
+    """The slice of httpx.Response the client reads, backed by an aiohttp response"""
+    __slots__ = ('_response', 'status_code', 'headers', 'content')
+    
+    def __init__(self, response: 'aiohttp.ClientResponse'):
+        self._response = response
+        self.status_code = response.status
+        self.headers = response.headers
+        self.content = b''
+    
+    async def aiter_bytes(self, chunk_size: int = XML_CHUNK_SIZE):
+        async for chunk in self._response.content.iter_chunked(chunk_size):
+            yield chunk
+    
+    async def aread(self) -> bytes:
+        self.content = await self._response.read()
+        return self.content
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self._response.charset or 'utf-8', errors='replace')
+
+
+class _AiohttpTransport:
+    """GETs over one pooled aiohttp session, created on first use inside the running loop"""
+    
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=RAKUTEN_TIMEOUT)
+            )
+        return self._session
+    
+    @contextlib.asynccontextmanager
+    async def stream(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None):
+        """Response whose body is read on demand (aiter_bytes / aread)"""
+        # aiohttp rejects None query values; httpx sends them empty
+        if params:
+            params = {key: '' if value is None else value for key, value in params.items()}
+        async with self._get_session().get(url, params=params, headers=headers) as response:
+            yield _AiohttpResponse(response)
+    
+    async def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> _AiohttpResponse:
+        async with self.stream(url, params=params, headers=headers) as response:
+            await response.aread()
+            return response
+    
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class _HttpxTransport:
+    """GETs over one pooled HTTP/2 httpx client"""
+    
+    def __init__(self):
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=RAKUTEN_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    
+    def stream(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None):
+        """Response whose body is read on demand (aiter_bytes / aread)"""
+        return self._client.stream('GET', url, params=params, headers=headers)
+    
+    async def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> httpx.Response:
+        return await self._client.get(url, params=params, headers=headers)
+    
+    async def aclose(self):
+        await self._client.aclose()
+
+
+def _make_transport():
+    """Transport selected by MARKETING_HTTP_BACKEND, falling back to httpx without aiohttp"""
+    if MARKETING_HTTP_BACKEND == 'aiohttp' and aiohttp is not None:
+        return _AiohttpTransport()
+    return _HttpxTransport()
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +382,32 @@ class RakutenAPIClient:
         self.coupon_api = 'https://coupon.linksynergy.com'
         self.product_api = 'https://productsearch.linksynergy.com'
         
+        # Fallback products with this SID's affiliate links, formatted once
+        self._mock_products = tuple(
+            {**product, 'affiliate_url': product['affiliate_url'].format(sid=self.sid)}
+            for product in _MOCK_PRODUCTS
+        )
+        
+        # Recently transformed products: {product key: (serialized source item, product)}
+        self._transform_cache: Dict[str, Tuple[bytes, Dict]] = {}
+        
+        # Coupon validators per cache key: (ETag, Last-Modified, coupons)
+        self._coupon_validators: Dict[str, Tuple[Optional[str], Optional[str], Tuple[Dict, ...]]] = {}
+        # In-flight coupon fetches, so concurrent misses share one request
+        self._coupon_fetches: Dict[str, asyncio.Task] = {}
+        
+        # Earliest time (monotonic) search_products_many may start its next search
+        self._next_search_at = 0.0
+        
+        # One pooled transport for every call so TCP/TLS connections are reused
+        self._transport = _make_transport()
+        
         logger.info(f"Rakuten client initialized with SID: {self.sid}")
     
+    async def close(self):
+        """Close the shared HTTP connection pool"""
+        await self._transport.aclose()
+    
     async def search_products(self, keyword: str, category: str = None, max_results: int = 20) -> List[Dict]:
         """Search for products using Rakuten Product Search API"""
         try:
@@ -34,74 +418,148 @@ class RakutenAPIClient:
                 'token': self.web_service_token,
                 'keyword': keyword,
                 'max': max_results,
-                'pagenumber': 1
+                'pagenumber': 1,
+                'output': 'json'
             }
             
             if category:
                 params['cat'] = category
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
-                
+            async with self._transport.stream(url, params=params) as response:
                 if response.status_code == 200:
-                    # Parse XML response
-                    import xml.etree.ElementTree as ET
-                    
                     try:
-                        root = ET.fromstring(response.text)
-                        products = []
+                        # JSON when the endpoint honours output=json, XML otherwise
+                        if 'json' in response.headers.get('content-type', ''):
+                            response_format = 'JSON'
+                            total_matches, products = self._products_from_json(await response.aread())
+                        else:
+                            response_format = 'XML'
+                            total_matches, products = await self._products_from_xml(response)
                         
-                        # Extract total matches info
-                        total_matches = root.findtext('TotalMatches', '0')
                         logger.info(f"Rakuten API found {total_matches} total matches for '{keyword}'")
-                        
-                        # Process each product item
-                        for item in root.findall('item'):
-                            try:
-                                # Extract product data from XML
-                                product_data = {
-                                    'id': item.findtext('linkid', ''),
-                                    'sku': item.findtext('sku', ''),
-                                    'name': item.findtext('productname', ''),
-                                    'merchantname': item.findtext('merchantname', ''),
-                                    'description': item.findtext('description/short', ''),
-                                    'price': float(item.findtext('saleprice', item.findtext('price', '0')).replace(' USD', '').replace('currency="USD">', '').strip()),
-                                    'originalPrice': float(item.findtext('price', '0').replace(' USD', '').replace('currency="USD">', '').strip()),
-                                    'imageUrl': item.findtext('imageurl', ''),
-                                    'linkUrl': item.findtext('linkurl', ''),
-                                    'category': item.findtext('category/primary', 'General'),
-                                    'upccode': item.findtext('upccode', ''),
-                                    'keywords': item.findtext('keywords', ''),
-                                    'createdon': item.findtext('createdon', '')
-                                }
-                                
-                                # Transform to our format
-                                product = self._transform_product(product_data)
-                                if product:
-                                    products.append(product)
-                                    
-                            except Exception as item_error:
-                                logger.warning(f"Error parsing product item: {item_error}")
-                                continue
-                        
-                        logger.info(f"Successfully parsed {len(products)} products from Rakuten XML response")
+                        logger.info(f"Successfully parsed {len(products)} products from Rakuten {response_format} response")
                         return products
                         
-                    except ET.ParseError as xml_error:
-                        logger.error(f"Error parsing Rakuten XML response: {xml_error}")
-                        logger.error(f"Response text: {response.text[:500]}...")
+                    except (XMLParseError, orjson.JSONDecodeError) as parse_error:
+                        logger.error(f"Error parsing Rakuten {response_format} response: {parse_error}")
                         return self._get_mock_products(keyword)
                         
                 else:
+                    await response.aread()
                     logger.error(f"Rakuten API error: {response.status_code} - {response.text}")
                     return self._get_mock_products(keyword)
-                    
+                
         except Exception as e:
             logger.error(f"Error searching Rakuten products: {e}")
             return self._get_mock_products(keyword)
     
+    def _products_from_json(self, content: bytes):
+        """Transform a JSON product-search payload; returns (total matches, products)"""
+        data = orjson.loads(content)
+        items = data.get('item') or data.get('items') or []
+        if isinstance(items, dict):
+            items = [items]
+        
+        products = []
+        for item in items:
+            try:
+                text = {path: _json_text(item, path) for path in _ITEM_PATHS}
+                product = self._transform_product(_product_data(text), _PRODUCT_DATA_FIELDS)
+                if product:
+                    products.append(product)
+            except Exception as item_error:
+                logger.warning(f"Error parsing product item: {item_error}")
+        
+        return data.get('TotalMatches', len(items)), products
+    
+    async def _products_from_xml(self, response):
+        """Transform a streamed XML product-search response; returns (total matches, products)"""
+        products = []
+        total_matches = '0'
+        
+        # Feed the body to a pull parser chunk by chunk as it arrives, handling each
+        # <item> as it closes, so the full payload is never buffered or decoded to str
+        parser = ET.XMLPullParser(events=('end',), **_XML_EVENT_FILTER)
+        async for chunk in response.aiter_bytes(XML_CHUNK_SIZE):
+            parser.feed(chunk)
+            total_matches = self._consume_xml_items(parser.read_events(), products) or total_matches
+        parser.close()
+        total_matches = self._consume_xml_items(parser.read_events(), products) or total_matches
+        
+        return total_matches, products
+    
+    def _consume_xml_items(self, events, products: List[Dict]) -> Optional[str]:
+        """Transform the closed <item> elements into products; returns TotalMatches if seen"""
+        total_matches = None
+        for _, item in events:
+            if item.tag == 'TotalMatches':
+                total_matches = item.text or '0'
+                continue
+            if item.tag != 'item':
+                continue
+            
+            try:
+                # Extract product data from XML with the precompiled accessors
+                text = _item_text(item)
+                product = self._transform_product(_product_data(text), _PRODUCT_DATA_FIELDS)
+                if product:
+                    products.append(product)
+            except Exception as item_error:
+                logger.warning(f"Error parsing product item: {item_error}")
+            finally:
+                item.clear()
+                if _LXML:
+                    # Detach the processed siblings too, so the root doesn't keep one
+                    # empty element per item for the rest of the page
+                    while item.getprevious() is not None:
+                        del item.getparent()[0]
+        
+        return total_matches
+    
+    async def _pace_search(self):
+        """Wait for this client's next search slot, SEARCH_REQUESTS_PER_SECOND apart"""
+        now = time.monotonic()
+        start = max(now, self._next_search_at)
+        self._next_search_at = start + 1 / SEARCH_REQUESTS_PER_SECOND
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def search_products_many(self, keywords: List[str], category: str = None,
+                                   max_results: int = 20) -> List[Union[List[Dict], Exception]]:
+        """
+        Search several keywords in parallel, paced and capped to stay within Rakuten's rate limit
+        Results line up with keywords; a failed search yields its exception in place of the products
+        """
+        semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        
+        async def _search(keyword: str) -> List[Dict]:
+            async with semaphore:
+                await self._pace_search()
+                return await self.search_products(keyword, category, max_results)
+        
+        return await asyncio.gather(*(_search(keyword) for keyword in keywords), return_exceptions=True)
+    
     async def get_coupons(self, advertiser_id: str = None) -> List[Dict]:
-        """Get available coupons and deals"""
+        """Get available coupons and deals (shared across workers for COUPON_CACHE_TTL seconds)"""
+        cache_key = f"rakuten:coupons:{self.sid}:{advertiser_id or 'all'}"
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Concurrent misses for the same advertiser await one shared fetch
+        task = self._coupon_fetches.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_coupons(cache_key, advertiser_id))
+            self._coupon_fetches[cache_key] = task
+            task.add_done_callback(lambda _: self._coupon_fetches.pop(cache_key, None))
+        # Shield so one cancelled caller doesn't cancel the shared fetch
+        coupons = await asyncio.shield(task)
+        
+        # Every caller gets its own dicts; the fetched ones are shared and kept for revalidation
+        return [dict(coupon) for coupon in coupons]
+    
+    async def _fetch_coupons(self, cache_key: str, advertiser_id: Optional[str]) -> List[Dict]:
+        """Fetch coupons, revalidating the last response for this cache key when possible"""
         try:
             url = f"{self.coupon_api}/coupon"
             
@@ -113,32 +571,41 @@ class RakutenAPIClient:
             if advertiser_id:
                 params['advertiserId'] = advertiser_id
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
+            # Revalidate the last response instead of re-downloading unchanged coupons
+            validated = self._coupon_validators.get(cache_key)
+            headers = {}
+            if validated is not None:
+                etag, last_modified, _ = validated
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            response = await self._transport.get(url, params=params, headers=headers)
+            
+            if response.status_code == 304 and validated is not None:
+                coupons = list(validated[2])
+                await cache_set(cache_key, COUPON_CACHE_TTL, coupons)
+                return coupons
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                items = data.get('coupons', []) if isinstance(data, dict) else []
+                coupons = [
+                    {out_key: item.get(in_key, '') for out_key, in_key in _COUPON_FIELDS}
+                    for item in items
+                ]
+                
+                etag = response.headers.get('etag')
+                last_modified = response.headers.get('last-modified')
+                if etag or last_modified:
+                    self._coupon_validators[cache_key] = (etag, last_modified, tuple(coupons))
+                
+                await cache_set(cache_key, COUPON_CACHE_TTL, coupons)
+                return coupons
+            else:
+                return self._get_mock_coupons()
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    coupons = []
-                    
-                    items = data.get('coupons', []) if isinstance(data, dict) else []
-                    
-                    for item in items:
-                        coupon = {
-                            'id': item.get('couponId', ''),
-                            'advertiser': item.get('advertiserName', ''),
-                            'title': item.get('couponName', ''),
-                            'description': item.get('description', ''),
-                            'code': item.get('couponCode', ''),
-                            'discount': item.get('discountAmount', ''),
-                            'expires': item.get('endDate', ''),
-                            'category': item.get('category', '')
-                        }
-                        coupons.append(coupon)
-                    
-                    return coupons
-                else:
-                    return self._get_mock_coupons()
-                    
         except Exception as e:
             logger.error(f"Error getting Rakuten coupons: {e}")
             return self._get_mock_coupons()
@@ -172,110 +639,100 @@ class RakutenAPIClient:
             logger.error(f"Error getting advertiser programs: {e}")
             return []
     
-    def _transform_product(self, item: Dict) -> Optional[Dict]:
-        """Transform Rakuten API response to our product format"""
+    async def gather_dashboard(self, keyword: str, advertiser_id: str = None, max_results: int = 20) -> Dict[str, List[Dict]]:
+        """Get products, coupons and programs concurrently"""
+        products, coupons, programs = await asyncio.gather(
+            self.search_products(keyword, max_results=max_results),
+            self.get_coupons(advertiser_id),
+            self.get_advertiser_programs(),
+            return_exceptions=True
+        )
+        
+        # Fall back per call so one failure doesn't sink the whole dashboard
+        if isinstance(products, Exception):
+            logger.error(f"Error searching Rakuten products: {products}")
+            products = self._get_mock_products(keyword)
+        if isinstance(coupons, Exception):
+            logger.error(f"Error getting Rakuten coupons: {coupons}")
+            coupons = self._get_mock_coupons()
+        if isinstance(programs, Exception):
+            logger.error(f"Error getting advertiser programs: {programs}")
+            programs = []
+        
+        return {
+            'products': products,
+            'coupons': coupons,
+            'programs': programs
+        }
+    
+    def _transform_product(self, item: Dict, field_map: Optional[Tuple] = None) -> Optional[Dict]:
+        """Transform Rakuten API response to our product format; `field_map` (from _field_map)
+        skips the fallback-key probing when the item's keys are known"""
+        # Items re-fetched across retries and pages transform identically; reuse the
+        # earlier result when the source item is unchanged. The item is compared by a
+        # serialized snapshot, so a caller reusing or mutating its dict can't match stale data
+        cache_key = item.get('productId') or item.get('sku') or item.get('id')
+        if cache_key:
+            try:
+                snapshot = orjson.dumps(item, option=orjson.OPT_SORT_KEYS)
+            except orjson.JSONEncodeError:
+                cache_key = None
+        if cache_key:
+            entry = self._transform_cache.get(cache_key)
+            if entry is not None and entry[0] == snapshot:
+                cached = entry[1]
+                return {**cached, 'tags': list(cached['tags'])}
+        
         try:
-            return {
-                'id': item.get('productId', item.get('id', f"rakuten_{hash(str(item))}")),
-                'name': item.get('productName', item.get('name', 'Rakuten Product')),
-                'description': item.get('description', item.get('shortDescription', '')),
-                'price': float(item.get('price', item.get('salePrice', 0))),
-                'original_price': float(item.get('retailPrice', item.get('originalPrice', 0))),
-                'image_url': item.get('imageUrl', item.get('image', '')),
-                'affiliate_url': item.get('linkUrl', item.get('clickUrl', '')),
-                'retailer': item.get('retailerName', item.get('merchant', 'Rakuten')),
-                'category': item.get('category', 'General'),
-                'rating': float(item.get('rating', item.get('customerRating', 0))),
-                'source': 'rakuten',
-                'tags': item.get('keywords', '').split(',') if item.get('keywords') else []
-            }
+            product = {}
+            if field_map is not None:
+                # Keys resolved up front: one lookup per field
+                for out_key, in_key, default, cast in field_map:
+                    value = item.get(in_key) if in_key else None
+                    if value is None:
+                        value = default
+                    product[out_key] = cast(value) if cast else value
+            else:
+                # One lookup per candidate key, stopping at the first present value
+                for out_key, in_keys, default, cast in _TRANSFORM_TABLE:
+                    value = default
+                    for in_key in in_keys:
+                        candidate = item.get(in_key)
+                        if candidate is not None:
+                            value = candidate
+                            break
+                    product[out_key] = cast(value) if cast else value
+            
+            if product['id'] is None:
+                product['id'] = _stable_id(item)
+            product['source'] = 'rakuten'
+            keywords = item.get('keywords')
+            product['tags'] = keywords.split(',') if keywords else []
         except Exception as e:
             logger.error(f"Error transforming product: {e}")
             return None
+        
+        if cache_key:
+            if cache_key not in self._transform_cache and len(self._transform_cache) >= TRANSFORM_CACHE_MAX_ENTRIES:
+                self._transform_cache.pop(next(iter(self._transform_cache)))
+            self._transform_cache[cache_key] = (snapshot, product)
+            # Callers get their own copy so the cached product can't be mutated
+            return {**product, 'tags': list(product['tags'])}
+        return product
     
     def _get_mock_products(self, keyword: str) -> List[Dict]:
         """Fallback mock products for testing"""
-        base_products = [
-            {
-                'id': 'rakuten_usb_hub',
-                'name': 'GEARit 7-Port USB 3.0 Hub with Power Adapter',
-                'description': 'High-speed USB 3.0 hub with individual power switches and LED indicators',
-                'price': 29.99,
-                'original_price': 39.99,
-                'image_url': 'https://images.unsplash.com/photo-1589492477829-5e65395b66cc?w=400',
-                'affiliate_url': f'https://click.linksynergy.com/deeplink?id={self.sid}&mid=12345&u1=usb-hub&murl=https://www.gearit.com/usb-hub',
-                'retailer': 'GEARit',
-                'category': 'Electronics',
-                'rating': 4.5,
-                'source': 'rakuten',
-                'tags': ['usb', 'hub', 'electronics', 'power']
-            },
-            {
-                'id': 'rakuten_wireless_mouse',
-                'name': 'Wireless Bluetooth Mouse with Ergonomic Design',
-                'description': 'Comfortable wireless mouse with long battery life and precision tracking',
-                'price': 24.99,
-                'original_price': 34.99,
-                'image_url': 'https://images.unsplash.com/photo-1527864550417-7fd91fc51a46?w=400',
-                'affiliate_url': f'https://click.linksynergy.com/deeplink?id={self.sid}&mid=12345&u1=wireless-mouse&murl=https://example.com/mouse',
-                'retailer': 'TechStore',
-                'category': 'Electronics',
-                'rating': 4.2,
-                'source': 'rakuten',
-                'tags': ['mouse', 'wireless', 'bluetooth', 'ergonomic']
-            },
-            {
-                'id': 'rakuten_keyboard',
-                'name': 'Mechanical Gaming Keyboard RGB Backlit',
-                'description': 'Professional mechanical keyboard with customizable RGB lighting',
-                'price': 89.99,
-                'original_price': 129.99,
-                'image_url': 'https://images.unsplash.com/photo-1541140532154-b024d705b90a?w=400',
-                'affiliate_url': f'https://click.linksynergy.com/deeplink?id={self.sid}&mid=12345&u1=gaming-keyboard&murl=https://example.com/keyboard',
-                'retailer': 'GameTech',
-                'category': 'Electronics',
-                'rating': 4.7,
-                'source': 'rakuten',
-                'tags': ['keyboard', 'gaming', 'mechanical', 'rgb']
-            }
-        ]
+        base_products = self._mock_products
         
         # Filter products based on keyword
-        keyword_lower = keyword.lower()
-        relevant_products = []
+        positions = _mock_product_positions(keyword) or (0, 1)
         
-        for product in base_products:
-            if (keyword_lower in product['name'].lower() or 
-                keyword_lower in product['description'].lower() or
-                any(keyword_lower in tag.lower() for tag in product['tags'])):
-                relevant_products.append(product)
-        
-        return relevant_products if relevant_products else base_products[:2]
+        # Copies, so callers can't edit the shared fallback data
+        return [{**base_products[i], 'tags': list(base_products[i]['tags'])} for i in positions]
     
     def _get_mock_coupons(self) -> List[Dict]:
         """Fallback mock coupons"""
-        return [
-            {
-                'id': 'gearit_20off',
-                'advertiser': 'GEARit',
-                'title': '20% Off USB Accessories',
-                'description': 'Save 20% on all USB hubs, cables and accessories',
-                'code': 'USB20OFF',
-                'discount': '20%',
-                'expires': '2024-12-31',
-                'category': 'Electronics'
-            },
-            {
-                'id': 'tech_15off',
-                'advertiser': 'TechStore',
-                'title': '$15 Off Orders Over $100',
-                'description': 'Get $15 off when you spend $100 or more',
-                'code': 'SAVE15',
-                'discount': '$15',
-                'expires': '2024-11-30',
-                'category': 'Electronics'
-            }
-        ]
+        return [dict(coupon) for coupon in _MOCK_COUPONS]
 
 def transform_rakuten_product(product_data: Dict) -> Dict:
     """Transform raw Rakuten product data to our standard format"""
@@ -298,12 +755,7 @@ def transform_rakuten_product(product_data: Dict) -> Dict:
         logger.error(f"Error transforming Rakuten product: {e}")
         return None
 
-# Singleton instance
-rakuten_client = None
-
+@functools.cache
 def get_rakuten_client() -> RakutenAPIClient:
     """Get Rakuten client singleton"""
-    global rakuten_client
-    if rakuten_client is None:
-        rakuten_client = RakutenAPIClient()
-    return rakuten_client
\ No newline at end of file
+    return RakutenAPIClient()
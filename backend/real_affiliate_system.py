@@ -60,11 +60,11 @@ class RealAffiliateSystem:
     async def get_real_commission_data(self) -> Dict[str, Any]:
         """Get real commission data from database - NO MOCK DATA"""
         try:
-            # Get actual conversions from database
-            conversions = await self.db.conversions.find().to_list(None)
-            
-            # Get actual affiliate links from database
-            links = await self.db.affiliate_links.find().to_list(None)
+            # Get actual conversions and affiliate links from database concurrently
+            conversions, links = await asyncio.gather(
+                self.db.conversions.find().to_list(None),
+                self.db.affiliate_links.find().to_list(None)
+            )
             
             # Calculate real statistics
             total_commissions = sum(c.get('commission_amount', 0) for c in conversions)
@@ -121,8 +121,6 @@ class RealAffiliateSystem:
                 }
             ]
             
-            clicks_data = await self.db.link_clicks.aggregate(clicks_pipeline).to_list(None)
-            
             # Real conversions data  
             conversions_pipeline = [
                 {
@@ -144,7 +142,11 @@ class RealAffiliateSystem:
                 }
             ]
             
-            conversions_data = await self.db.conversions.aggregate(conversions_pipeline).to_list(None)
+            # Both aggregations are independent; run them concurrently
+            clicks_data, conversions_data = await asyncio.gather(
+                self.db.link_clicks.aggregate(clicks_pipeline).to_list(None),
+                self.db.conversions.aggregate(conversions_pipeline).to_list(None)
+            )
             
             return {
                 "clicks_data": clicks_data,
@@ -168,39 +170,44 @@ class RealAffiliateSystem:
     async def get_real_partner_programs(self) -> List[Dict[str, Any]]:
         """Get real partner program data from Rakuten"""
         try:
-            programs = []
-            
-            for partner_name, partner_info in self.partners.items():
-                # Get real product count for this partner
-                product_count = await self.db.products.count_documents({
-                    "program": partner_name,
-                    "source": "rakuten"
-                })
-                
-                # Get real commission data for this partner
-                partner_commissions = await self.db.conversions.find({
-                    "affiliate_program": partner_name
-                }).to_list(None)
-                
-                total_earnings = sum(c.get('commission_amount', 0) for c in partner_commissions)
-                
-                programs.append({
-                    "name": partner_name,
-                    "commission_rate": partner_info["commission_rate"],
-                    "category": partner_info["category"],
-                    "product_count": product_count,
-                    "total_earnings": total_earnings,
-                    "avg_commission": partner_info["avg_commission"],
-                    "status": "active" if product_count > 0 else "pending_import",
-                    "last_import": await self._get_last_import_date(partner_name)
-                })
-            
-            return programs
+            # Every partner's queries are independent; fetch them all concurrently
+            return list(await asyncio.gather(*(
+                self._get_partner_program(partner_name, partner_info)
+                for partner_name, partner_info in self.partners.items()
+            )))
             
         except Exception as e:
             logger.error(f"Error getting real partner programs: {e}")
             return []
     
+    async def _get_partner_program(self, partner_name: str, partner_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Get real product count, earnings and last import for one partner"""
+        product_count, partner_commissions, last_import = await asyncio.gather(
+            # Real product count for this partner
+            self.db.products.count_documents({
+                "program": partner_name,
+                "source": "rakuten"
+            }),
+            # Real commission data for this partner
+            self.db.conversions.find({
+                "affiliate_program": partner_name
+            }).to_list(None),
+            self._get_last_import_date(partner_name)
+        )
+        
+        total_earnings = sum(c.get('commission_amount', 0) for c in partner_commissions)
+        
+        return {
+            "name": partner_name,
+            "commission_rate": partner_info["commission_rate"],
+            "category": partner_info["category"],
+            "product_count": product_count,
+            "total_earnings": total_earnings,
+            "avg_commission": partner_info["avg_commission"],
+            "status": "active" if product_count > 0 else "pending_import",
+            "last_import": last_import
+        }
+    
     async def _get_last_import_date(self, partner_name: str) -> Optional[str]:
         """Get the last import date for a partner"""
         try:
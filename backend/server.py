@@ -1,16 +1,19 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, File, UploadFile
+from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, File, UploadFile, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Dict, Any
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 import aiohttp
-import asyncio
+import random
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import re
 from emergentintegrations.llm.chat import LlmChat, UserMessage
@@ -19,12 +22,14 @@ from sendgrid.helpers.mail import Mail, Content
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 import json
+import orjson
 import csv
 import io
-from rakuten_client import get_rakuten_client, RakutenAPIClient, transform_rakuten_product
-from gearit_client import get_gearit_client
-from google_analytics import google_analytics
-from affiliate_networks import affiliate_networks
+from rakuten_client import get_rakuten_client
+from gearit_client import get_gearit_client, close_gearit_session
+from shared_cache import close_shared_cache
+from google_analytics import get_google_analytics
+from affiliate_networks import get_affiliate_networks
 from zapier_integration import zapier_webhooks
 from real_affiliate_system import get_real_affiliate_system
 
@@ -35,9 +40,6 @@ load_dotenv(ROOT_DIR / '.env')
 print(f"🔍 RAKUTEN_CLIENT_ID loaded: {os.environ.get('RAKUTEN_CLIENT_ID', 'NOT FOUND')}")
 print(f"🔍 RAKUTEN_CLIENT_SECRET loaded: {'YES' if os.environ.get('RAKUTEN_CLIENT_SECRET') else 'NO'}")
 
-# Initialize Rakuten client
-rakuten_client = RakutenAPIClient()
-
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
@@ -59,6 +61,45 @@ SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'noreply@example.com')
 # Scheduler for content publishing
 scheduler = AsyncIOScheduler()
 
+# Scraping patterns, compiled once instead of looked up in re's cache per element
+_RE_AMAZON_ASIN = re.compile(r'/dp/([A-Z0-9]{10})')
+_RE_PRICE_AMOUNT = re.compile(r'(\d+(?:\.\d{2})?)')
+_RE_PRICE_SHORT = re.compile(r'(\d{1,5}(?:\.\d{2})?)')
+_RE_RATING = re.compile(r'(\d\.?\d?)')
+_RE_COUNT = re.compile(r'(\d+)')
+_RE_HASHTAG = re.compile(r'#\w+')
+_RE_DOLLAR_TEXT = re.compile(r'\$\d+')
+_RE_DOLLAR_PRICE = re.compile(r'\$(\d+(?:\.\d{2})?)')
+
+# One pooled session for page scraping (previews, product pages, competitors)
+_scrape_session: Optional[aiohttp.ClientSession] = None
+
+async def get_scrape_session() -> aiohttp.ClientSession:
+    """Get or create the shared scraping session"""
+    global _scrape_session
+    if _scrape_session is None or _scrape_session.closed:
+        _scrape_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+        )
+    return _scrape_session
+
+@asynccontextmanager
+async def scrape_session():
+    """Borrow the shared scraping session; it stays open after the block"""
+    yield await get_scrape_session()
+
+async def close_scrape_session():
+    """Close the shared scraping session (call once at app shutdown)"""
+    global _scrape_session
+    if _scrape_session is not None and not _scrape_session.closed:
+        await _scrape_session.close()
+    _scrape_session = None
+
 # Define Models
 class Product(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -251,7 +292,7 @@ class AutomationWorkflow(BaseModel):
 async def get_url_preview(url: str) -> Dict[str, Any]:
     """Get basic preview info from URL without full scraping"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with scrape_session() as session:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
@@ -259,8 +300,8 @@ async def get_url_preview(url: str) -> Dict[str, Any]:
                 if response.status != 200:
                     return {"title": "Unknown", "source": extract_domain(url)}
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                html = await response.read()
+                soup = BeautifulSoup(html, 'lxml', from_encoding=response.charset)
                 
                 # Extract basic info
                 title = extract_product_name(soup)
@@ -289,7 +330,6 @@ async def scrape_product_data(url: str, category: str) -> Optional[Dict[str, Any
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15'
         ]
         
-        import random
         headers = {
             'User-Agent': random.choice(user_agents),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -305,9 +345,9 @@ async def scrape_product_data(url: str, category: str) -> Optional[Dict[str, Any
         
         timeout = aiohttp.ClientTimeout(total=30)
         
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with scrape_session() as session:
             print(f"Scraping URL: {url}")
-            async with session.get(url, headers=headers) as response:
+            async with session.get(url, headers=headers, timeout=timeout) as response:
                 print(f"Response status: {response.status}")
                 
                 if response.status == 503:
@@ -317,15 +357,20 @@ async def scrape_product_data(url: str, category: str) -> Optional[Dict[str, Any
                     print(f"Failed to fetch {url} - Status: {response.status}")
                     return create_fallback_product(url, category)
                 
-                html = await response.text()
+                # Keep the body as bytes; lxml decodes it while parsing
+                html = await response.read()
                 print(f"HTML length: {len(html)}")
                 
-                # Check if we got blocked (Amazon shows captcha/robot check)
-                if 'robot' in html.lower() or 'captcha' in html.lower() or len(html) < 10000:
+                # Check if we got blocked (Amazon shows captcha/robot check). The size limit
+                # counts characters; at most 4 bytes each, only a body under 40,000 bytes
+                # can fall short, so only those are decoded to check
+                html_lower = html.lower()
+                too_short = len(html) < 40000 and len(await response.text()) < 10000
+                if b'robot' in html_lower or b'captcha' in html_lower or too_short:
                     print("Detected bot blocking - creating fallback product")
                     return create_fallback_product(url, category)
                 
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = BeautifulSoup(html, 'lxml', from_encoding=response.charset)
                 
                 # Enhanced scraping logic
                 product_data = {
@@ -358,7 +403,7 @@ def create_fallback_product(url: str, category: str) -> Dict[str, Any]:
     # Extract product ID from URL for better naming
     product_id = ""
     if 'amazon.com' in url:
-        match = re.search(r'/dp/([A-Z0-9]{10})', url)
+        match = _RE_AMAZON_ASIN.search(url)
         if match:
             product_id = match.group(1)
     
@@ -418,9 +463,9 @@ def extract_original_price(soup):
             element = soup.select_one(selector)
             if element:
                 price_text = element.get_text().strip()
-                # Remove currency symbols
-                price_text = price_text.replace('$', '').replace(',', '').replace('USD', '').strip()
-                price_match = re.search(r'(\d+(?:\.\d{2})?)', price_text)
+                # Drop thousands separators; currency marks don't affect the digit match
+                price_text = price_text.replace(',', '')
+                price_match = _RE_PRICE_AMOUNT.search(price_text)
                 if price_match:
                     original_price = float(price_match.group(1))
                     if original_price > 0 and original_price < 100000:
@@ -552,11 +597,11 @@ def extract_price(soup):
                 if not price_text:
                     continue
                     
-                # Clean Amazon price text
-                price_text = price_text.replace('$', '').replace(',', '').replace('USD', '').strip()
+                # Clean Amazon price text (thousands separators only; '$'/'USD' never match)
+                price_text = price_text.replace(',', '')
                 
                 # Look for price pattern
-                price_match = re.search(r'(\d{1,5}(?:\.\d{2})?)', price_text)
+                price_match = _RE_PRICE_SHORT.search(price_text)
                 if price_match:
                     price = float(price_match.group(1))
                     if 1 <= price <= 50000:  # Reasonable price range
@@ -578,7 +623,7 @@ def extract_price(soup):
             element = soup.select_one(selector)
             if element:
                 price_text = element.get_text().strip()
-                price_match = re.search(r'(\d{1,5}(?:\.\d{2})?)', price_text.replace(',', ''))
+                price_match = _RE_PRICE_SHORT.search(price_text.replace(',', ''))
                 if price_match:
                     price = float(price_match.group(1))
                     if 1 <= price <= 50000:
@@ -617,8 +662,8 @@ def extract_price(soup):
             if element:
                 price_text = element.get_text().strip()
                 if price_text:
-                    price_text = price_text.replace('$', '').replace(',', '').replace('USD', '').strip()
-                    price_match = re.search(r'(\d{1,5}(?:\.\d{2})?)', price_text)
+                    price_text = price_text.replace(',', '')
+                    price_match = _RE_PRICE_SHORT.search(price_text)
                     if price_match:
                         price = float(price_match.group(1))
                         if 1 <= price <= 50000:
@@ -633,7 +678,7 @@ def extract_price(soup):
         scripts = soup.find_all('script', type='application/ld+json')
         for script in scripts:
             try:
-                data = json.loads(script.string)
+                data = orjson.loads(script.string)
                 if isinstance(data, list):
                     data = data[0]
                 
@@ -654,7 +699,7 @@ def extract_price(soup):
                                 print(f"Found JSON-LD price: ${value}")
                                 return float(value)
                         elif isinstance(value, str):
-                            price_match = re.search(r'(\d{1,5}(?:\.\d{2})?)', value)
+                            price_match = _RE_PRICE_SHORT.search(value)
                             if price_match:
                                 price = float(price_match.group(1))
                                 if 1 <= price <= 50000:
@@ -724,7 +769,7 @@ def extract_rating(soup):
         element = soup.select_one(selector)
         if element:
             rating_text = element.get_text().strip()
-            rating_match = re.search(r'(\d\.?\d?)', rating_text)
+            rating_match = _RE_RATING.search(rating_text)
             if rating_match:
                 return float(rating_match.group())
     return None
@@ -741,7 +786,7 @@ def extract_reviews_count(soup):
         element = soup.select_one(selector)
         if element:
             count_text = element.get_text().strip()
-            count_match = re.search(r'(\d+)', count_text.replace(',', ''))
+            count_match = _RE_COUNT.search(count_text.replace(',', ''))
             if count_match:
                 return int(count_match.group())
     return None
@@ -767,7 +812,6 @@ def extract_features(soup):
 
 def extract_domain(url):
     """Extract domain from URL"""
-    from urllib.parse import urlparse
     return urlparse(url).netloc
 
 # Enhanced Content Generation Functions
@@ -1121,15 +1165,15 @@ async def save_urls_bulk(bulk_data: BulkUrlSave):
         for url in batch:
             try:
                 # Get preview info with shorter timeout for bulk operations
-                async with aiohttp.ClientSession() as session:
+                async with scrape_session() as session:
                     headers = {
                         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                     }
                     try:
                         async with session.get(url, headers=headers, timeout=5) as response:
                             if response.status == 200:
-                                html = await response.text()
-                                soup = BeautifulSoup(html, 'html.parser')
+                                html = await response.read()
+                                soup = BeautifulSoup(html, 'lxml', from_encoding=response.charset)
                                 title = extract_product_name(soup)
                                 source = extract_domain(url)
                                 estimated_price = extract_price(soup)
@@ -1920,7 +1964,7 @@ async def auto_generate_social_content(product_id: str, platforms: List[str]):
 
 def extract_hashtags(text: str) -> List[str]:
     """Extract hashtags from text"""
-    return re.findall(r'#\w+', text)
+    return _RE_HASHTAG.findall(text)
 
 # =====================================================
 # CONTENT STUDIO ENDPOINTS
@@ -2025,14 +2069,14 @@ async def analyze_competitors(competitor_urls: List[str]):
     for url in competitor_urls:
         try:
             # Basic competitor analysis
-            async with aiohttp.ClientSession() as session:
+            async with scrape_session() as session:
                 headers = {
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 }
                 async with session.get(url, headers=headers, timeout=15) as response:
                     if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
+                        html = await response.read()
+                        soup = BeautifulSoup(html, 'lxml', from_encoding=response.charset)
                         
                         analysis = CompetitorAnalysis(
                             competitor_url=url,
@@ -2056,12 +2100,13 @@ async def identify_content_gaps(soup) -> List[str]:
     # Simple gap analysis - can be enhanced
     gaps = []
     
-    # Check for missing content types
-    if not soup.find_all(['video', '.video']):
+    # Check for missing content types; find() stops at the first match instead
+    # of collecting every matching element just to test for emptiness
+    if soup.find(['video', '.video']) is None:
         gaps.append("Video content missing")
-    if not soup.find_all(['.review', '.testimonial']):
+    if soup.find(['.review', '.testimonial']) is None:
         gaps.append("Customer reviews/testimonials")
-    if not soup.find_all(['.comparison', '.vs']):
+    if soup.find(['.comparison', '.vs']) is None:
         gaps.append("Product comparisons")
     
     return gaps
@@ -2071,7 +2116,7 @@ async def find_pricing_advantages(soup) -> List[Dict[str, Any]]:
     advantages = []
     
     # Extract prices and compare (simplified)
-    price_elements = soup.find_all(['span', 'div'], text=re.compile(r'\$\d+'))
+    price_elements = soup.find_all(['span', 'div'], text=_RE_DOLLAR_TEXT)
     if price_elements:
         advantages.append({
             "type": "pricing_opportunity",
@@ -2083,7 +2128,7 @@ async def find_pricing_advantages(soup) -> List[Dict[str, Any]]:
 def extract_avg_pricing(soup) -> float:
     """Extract average pricing from competitor page"""
     prices = []
-    price_pattern = re.compile(r'\$(\d+(?:\.\d{2})?)')
+    price_pattern = _RE_DOLLAR_PRICE
     
     for element in soup.find_all(text=price_pattern):
         matches = price_pattern.findall(element)
@@ -2186,7 +2231,7 @@ async def execute_workflow_action(action: Dict[str, Any], context: Dict[str, Any
 async def test_rakuten_connection():
     """Test REAL Rakuten API connection with your marketing credentials"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         
         # Test by searching for a simple product
         test_products = await rakuten_client.search_products("laptop", max_results=1)
@@ -2207,7 +2252,7 @@ async def test_rakuten_connection():
 async def rakuten_search_products(request: dict):
     """Search products using real Rakuten API with new credentials"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         
         keyword = request.get('keyword', '')
         category = request.get('category', '')
@@ -2248,7 +2293,7 @@ async def search_rakuten_products(
 ):
     """Search REAL Rakuten products with Web Service Token (Legacy endpoint)"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         
         # Filter by price if specified
         products = await rakuten_client.search_products(
@@ -2294,7 +2339,7 @@ async def import_rakuten_products(
 ):
     """Import REAL Rakuten products directly into database"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         products = await rakuten_client.search_products(
             keyword=keyword,
             category=category,
@@ -2347,25 +2392,41 @@ async def import_rakuten_products(
 async def rakuten_get_coupons(advertiser_id: str = None):
     """Get available Rakuten coupons and deals"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         coupons = await rakuten_client.get_coupons(advertiser_id)
         
-        return {
-            "success": True,
-            "coupons": coupons,
-            "count": len(coupons),
-            "message": f"Found {len(coupons)} coupons"
-        }
+        return Response(
+            content=orjson.dumps({
+                "success": True,
+                "coupons": coupons,
+                "count": len(coupons),
+                "message": f"Found {len(coupons)} coupons"
+            }),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.error(f"Rakuten coupons error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/rakuten/dashboard")
+async def rakuten_get_dashboard(keyword: str = "electronics", advertiser_id: str = None, max_results: int = 20):
+    """Get Rakuten products, coupons and programs in one concurrent round"""
+    try:
+        dashboard = await get_rakuten_client().gather_dashboard(keyword, advertiser_id, max_results)
+        return Response(
+            content=orjson.dumps({"success": True, "data": dashboard}),
+            media_type="application/json"
+        )
+    except Exception as e:
+        logger.error(f"Rakuten dashboard error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/rakuten/programs")
 async def rakuten_get_programs():
     """Get available Rakuten advertiser programs"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         programs = await rakuten_client.get_advertiser_programs()
         
         return {
@@ -2383,7 +2444,7 @@ async def rakuten_get_programs():
 async def get_rakuten_advertisers():
     """Get list of REAL Rakuten advertisers (Legacy endpoint)"""
     try:
-        rakuten_client = RakutenAPIClient()
+        rakuten_client = get_rakuten_client()
         programs = await rakuten_client.get_advertiser_programs()
         
         # Transform to legacy format
@@ -2422,30 +2483,40 @@ async def startup_event():
 # Phase 3 - Tech Platform Integrations API Endpoints
 
 @api_router.get("/integrations/google-analytics/performance")
-async def get_analytics_performance(days: int = 30):
+async def get_analytics_performance(days: int = 30, force_refresh: bool = False):
     """Get Google Analytics performance data for affiliate links"""
     try:
-        performance_data = await google_analytics.get_affiliate_performance(days)
+        performance_data = await get_google_analytics().get_affiliate_performance(days, force_refresh=force_refresh)
         return {"success": True, "data": performance_data}
     except Exception as e:
         logger.error(f"Error getting analytics performance: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/integrations/google-analytics/realtime")
-async def get_analytics_realtime():
+async def get_analytics_realtime(force_refresh: bool = False):
     """Get real-time Google Analytics data"""
     try:
-        realtime_data = await google_analytics.get_realtime_data()
+        realtime_data = await get_google_analytics().get_realtime_data(force_refresh=force_refresh)
         return {"success": True, "data": realtime_data}
     except Exception as e:
         logger.error(f"Error getting realtime analytics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/integrations/google-analytics/dashboard")
+async def get_analytics_dashboard(days: int = 30):
+    """Get Google Analytics performance and realtime data concurrently"""
+    try:
+        dashboard = await get_google_analytics().gather_dashboard(days)
+        return {"success": True, "data": dashboard}
+    except Exception as e:
+        logger.error(f"Error getting analytics dashboard: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.post("/integrations/google-analytics/track-conversion")
 async def track_analytics_conversion(link_id: str, revenue: float, product_name: str):
     """Track affiliate conversion in Google Analytics"""
     try:
-        success = await google_analytics.track_affiliate_conversion(link_id, revenue, product_name)
+        success = await get_google_analytics().track_affiliate_conversion(link_id, revenue, product_name)
         return {"success": success, "message": "Conversion tracked successfully" if success else "Failed to track conversion"}
     except Exception as e:
         logger.error(f"Error tracking conversion: {e}")
@@ -2457,8 +2528,14 @@ async def track_analytics_conversion(link_id: str, revenue: float, product_name:
 async def search_affiliate_programs(category: str = "", keywords: str = ""):
     """Search affiliate programs across all networks"""
     try:
-        programs = await affiliate_networks.search_all_programs(category, keywords)
-        return {"success": True, "programs": programs, "count": len(programs)}
+        programs = [
+            program.asdict()
+            for program in await get_affiliate_networks().search_all_programs(category, keywords)
+        ]
+        return Response(
+            content=orjson.dumps({"success": True, "programs": programs, "count": len(programs)}),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error(f"Error searching affiliate programs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -2467,8 +2544,11 @@ async def search_affiliate_programs(category: str = "", keywords: str = ""):
 async def get_affiliate_commissions(days: int = 30):
     """Get commission data from all affiliate networks"""
     try:
-        commission_data = await affiliate_networks.get_all_commissions(days)
-        return {"success": True, "data": commission_data}
+        commission_data = await get_affiliate_networks().get_all_commissions_json(days)
+        return Response(
+            content=orjson.dumps({"success": True, "data": orjson.Fragment(commission_data)}),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error(f"Error getting affiliate commissions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -3151,18 +3231,24 @@ async def import_gearit_sample_products():
         gearit_client = get_gearit_client()
         products = await gearit_client.get_sample_products()
         
+        # One lookup for every existing sample ID and one bulk insert, instead of
+        # a find_one + insert_one round-trip per product
         imported_count = 0
-        for product in products:
+        existing_ids = {
+            doc["id"]
+            async for doc in db.products.find(
+                {"id": {"$in": [product.id for product in products]}}, {"id": 1}
+            )
+        }
+        new_documents = [product.asdict() for product in products if product.id not in existing_ids]
+        if new_documents:
             try:
-                # Check if product already exists
-                existing = await db.products.find_one({"id": product["id"]})
-                if not existing:
-                    await db.products.insert_one(product)
-                    imported_count += 1
-                    
-            except Exception as insert_error:
-                logger.warning(f"Failed to import product {product.get('id', 'unknown')}: {insert_error}")
-                continue
+                result = await db.products.insert_many(new_documents, ordered=False)
+                imported_count = len(result.inserted_ids)
+            except BulkWriteError as insert_error:
+                # Unordered: every document that could be written was, so count those
+                logger.warning(f"Failed to import some GEARit products: {insert_error}")
+                imported_count = insert_error.details['nInserted']
         
         return {
             "success": True,
@@ -3291,22 +3377,27 @@ async def import_all_partner_products():
             "GearIT": {
                 "search_terms": ["gearit", "gear it"],
                 "commission_rate": 8.0,
-                "category": "Electronics"
+                "category": "Electronics",
+                "retailer_keywords": ("gearit",)
             },
             "NordVPN APAC": {
                 "search_terms": ["nordvpn", "nord vpn"],
                 "commission_rate": 35.0,
-                "category": "Software & Security"
+                "category": "Software & Security",
+                "retailer_keywords": ("nord",)
             },
             "Sharper Image": {
                 "search_terms": ["sharper image"],
                 "commission_rate": 12.0,
-                "category": "Electronics & Gadgets"
+                "category": "Electronics & Gadgets",
+                "retailer_keywords": ("sharper",)
             },
             "Wondershare": {
                 "search_terms": ["wondershare", "filmora", "pdfelement"],
                 "commission_rate": 25.0,
-                "category": "Software"
+                "category": "Software",
+                "retailer_keywords": ("wondershare",),
+                "name_keywords": ("wondershare",)
             }
         }
         
@@ -3319,66 +3410,55 @@ async def import_all_partner_products():
             partner_imported = 0
             unique_products = {}
             
-            for search_term in partner_info["search_terms"]:
-                try:
-                    logger.info(f"Searching {partner_name} for: {search_term}")
-                    
-                    # Search with high limit to get comprehensive results
-                    products = await rakuten_client.search_products(search_term, max_results=100)
-                    
-                    logger.info(f"Found {len(products)} products for '{search_term}'")
-                    
-                    for product in products:
-                        # Filter by merchant name matching partner
-                        retailer = product.get('retailer', '').lower()
+            # Search every term for this partner at once, with high limit to get comprehensive results
+            search_terms = partner_info["search_terms"]
+            retailer_keywords = partner_info["retailer_keywords"]
+            name_keywords = partner_info.get("name_keywords", ())
+            search_results = await rakuten_client.search_products_many(search_terms, max_results=100)
+            
+            for search_term, products in zip(search_terms, search_results):
+                if isinstance(products, Exception):
+                    logger.warning(f"Search failed for {partner_name} '{search_term}': {products}")
+                    continue
+                
+                logger.info(f"Found {len(products)} products for '{search_term}'")
+                
+                for product in products:
+                    # Check if product is from this partner by merchant name (or product name)
+                    retailer = product.get('retailer', '').lower()
+                    is_partner_product = any(keyword in retailer for keyword in retailer_keywords)
+                    if not is_partner_product and name_keywords:
                         name = product.get('name', '').lower()
-                        
-                        # Check if product is from this partner
-                        is_partner_product = False
-                        if partner_name == "GearIT" and 'gearit' in retailer:
-                            is_partner_product = True
-                        elif partner_name == "NordVPN APAC" and ('nordvpn' in retailer or 'nord' in retailer):
-                            is_partner_product = True
-                        elif partner_name == "Sharper Image" and 'sharper' in retailer:
-                            is_partner_product = True
-                        elif partner_name == "Wondershare" and ('wondershare' in retailer or 'wondershare' in name):
-                            is_partner_product = True
-                        
-                        if is_partner_product:
-                            product_id = product.get('id')
-                            if product_id not in unique_products:
-                                unique_products[product_id] = product
-                                
-                                # Try to import to database
-                                try:
-                                    # Check if already exists
-                                    existing = await db.products.find_one({"id": product_id})
-                                    if not existing:
-                                        # Enhance product data
-                                        enhanced_product = {
-                                            **product,
-                                            'source': 'rakuten',
-                                            'scraped_at': datetime.now(timezone.utc).isoformat(),
-                                            'program': partner_name,
-                                            'commission_rate': partner_info["commission_rate"],
-                                            'category': partner_info["category"]
-                                        }
-                                        
-                                        await db.products.insert_one(enhanced_product)
-                                        partner_imported += 1
-                                        total_imported += 1
-                                        logger.info(f"Imported {partner_name}: {product.get('name')}")
-                                        
-                                except Exception as import_error:
-                                    logger.warning(f"Failed to import {partner_name} product {product_id}: {import_error}")
-                                    continue
-                    
-                    # Rate limiting
-                    await asyncio.sleep(0.5)
+                        is_partner_product = any(keyword in name for keyword in name_keywords)
                     
-                except Exception as search_error:
-                    logger.warning(f"Search failed for {partner_name} '{search_term}': {search_error}")
-                    continue
+                    if is_partner_product:
+                        product_id = product.get('id')
+                        if product_id not in unique_products:
+                            unique_products[product_id] = product
+                            
+                            # Try to import to database
+                            try:
+                                # Check if already exists
+                                existing = await db.products.find_one({"id": product_id})
+                                if not existing:
+                                    # Enhance product data
+                                    enhanced_product = {
+                                        **product,
+                                        'source': 'rakuten',
+                                        'scraped_at': datetime.now(timezone.utc).isoformat(),
+                                        'program': partner_name,
+                                        'commission_rate': partner_info["commission_rate"],
+                                        'category': partner_info["category"]
+                                    }
+                                    
+                                    await db.products.insert_one(enhanced_product)
+                                    partner_imported += 1
+                                    total_imported += 1
+                                    logger.info(f"Imported {partner_name}: {product.get('name')}")
+                                    
+                            except Exception as import_error:
+                                logger.warning(f"Failed to import {partner_name} product {product_id}: {import_error}")
+                                continue
             
             partner_results[partner_name] = {
                 "imported": partner_imported,
@@ -3444,43 +3524,40 @@ async def import_single_partner_products(partner_name: str):
         
         logger.info(f"Starting comprehensive import for {config['name']}...")
         
-        for search_term in config["search_terms"]:
-            try:
-                logger.info(f"Searching {config['name']} for: '{search_term}'")
-                
-                products = await rakuten_client.search_products(search_term, max_results=100)
-                
-                for product in products:
-                    retailer = product.get('retailer', '').lower()
-                    
-                    if config["merchant_filter"] in retailer:
-                        product_id = product.get('id')
-                        if product_id not in unique_products:
-                            unique_products[product_id] = product
-                            
-                            try:
-                                existing = await db.products.find_one({"id": product_id})
-                                if not existing:
-                                    enhanced_product = {
-                                        **product,
-                                        'source': 'rakuten',
-                                        'scraped_at': datetime.now(timezone.utc).isoformat(),
-                                        'program': config['name'],
-                                        'commission_rate': config["commission_rate"]
-                                    }
-                                    
-                                    await db.products.insert_one(enhanced_product)
-                                    imported_count += 1
-                                    
-                            except Exception as import_error:
-                                logger.warning(f"Failed to import product: {import_error}")
-                                continue
-                
-                await asyncio.sleep(0.3)  # Rate limiting
-                
-            except Exception as search_error:
-                logger.warning(f"Search failed for '{search_term}': {search_error}")
+        # search_products_many paces and caps the searches to respect Rakuten's rate limit
+        search_terms = config["search_terms"]
+        search_results = await rakuten_client.search_products_many(search_terms, max_results=100)
+        
+        for search_term, products in zip(search_terms, search_results):
+            if isinstance(products, Exception):
+                logger.warning(f"Search failed for '{search_term}': {products}")
                 continue
+            
+            for product in products:
+                retailer = product.get('retailer', '').lower()
+                
+                if config["merchant_filter"] in retailer:
+                    product_id = product.get('id')
+                    if product_id not in unique_products:
+                        unique_products[product_id] = product
+                        
+                        try:
+                            existing = await db.products.find_one({"id": product_id})
+                            if not existing:
+                                enhanced_product = {
+                                    **product,
+                                    'source': 'rakuten',
+                                    'scraped_at': datetime.now(timezone.utc).isoformat(),
+                                    'program': config['name'],
+                                    'commission_rate': config["commission_rate"]
+                                }
+                                
+                                await db.products.insert_one(enhanced_product)
+                                imported_count += 1
+                                
+                        except Exception as import_error:
+                            logger.warning(f"Failed to import product: {import_error}")
+                            continue
         
         return {
             "success": True,
@@ -3607,4 +3684,10 @@ logger = logging.getLogger(__name__)
 @app.on_event("shutdown")
 async def shutdown_db_client():
     scheduler.shutdown()
+    await close_gearit_session()
+    if get_rakuten_client.cache_info().currsize:
+        await get_rakuten_client().close()
+    await close_shared_cache()
+    await zapier_webhooks.aclose()
+    await close_scrape_session()
     client.close()
\ No newline at end of file
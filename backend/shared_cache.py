@@ -0,0 +1,62 @@
+"""
+Cross-worker response cache backed by Redis
+"""
+import os
+import orjson
+import logging
+from typing import Any, Optional
+
+# Optional: without the redis package or REDIS_URL every call is a cache miss
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+# Keep an unreachable Redis from stalling the request that falls back to the API
+REDIS_TIMEOUT = 0.5
+
+_redis = None
+
+def _get_redis():
+    """Lazily create the shared Redis client; None when Redis is not configured"""
+    global _redis
+    if _redis is None and aioredis is not None and REDIS_URL:
+        _redis = aioredis.Redis.from_url(
+            REDIS_URL,
+            socket_timeout=REDIS_TIMEOUT,
+            socket_connect_timeout=REDIS_TIMEOUT
+        )
+    return _redis
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Get a cached value, or None on a miss or any Redis error"""
+    redis = _get_redis()
+    if redis is None:
+        return None
+    try:
+        data = await redis.get(key)
+        return orjson.loads(data) if data is not None else None
+    except Exception as e:
+        logger.warning(f"Shared cache read failed for {key}: {e}")
+        return None
+
+async def cache_set(key: str, ttl: int, value: Any):
+    """Cache a value for `ttl` seconds; Redis errors are logged and ignored"""
+    redis = _get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.setex(key, ttl, orjson.dumps(value))
+    except Exception as e:
+        logger.warning(f"Shared cache write failed for {key}: {e}")
+
+async def close_shared_cache():
+    """Close the Redis connection pool (call once at app shutdown)"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
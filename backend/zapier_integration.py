@@ -4,6 +4,7 @@ Webhook endpoints and automation triggers for Zapier integration
 """
 import os
 import httpx
+import orjson
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -11,6 +12,9 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Webhook payloads are encoded with orjson rather than httpx's stdlib json
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
 class ZapierWebhookManager:
     def __init__(self):
         self.base_url = "https://hooks.zapier.com/hooks/catch"
@@ -22,6 +26,17 @@ class ZapierWebhookManager:
             'price_alert': os.getenv('ZAPIER_PRICE_ALERT_WEBHOOK'),
             'email_campaign': os.getenv('ZAPIER_EMAIL_WEBHOOK')
         }
+        
+        # Pooled client shared by every trigger, so webhook bursts reuse TLS connections
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    
+    async def aclose(self):
+        """Close the shared HTTP connection pool"""
+        await self._http.aclose()
     
     async def trigger_new_affiliate_link(self, link_data: Dict) -> bool:
         """Trigger Zapier webhook when new affiliate link is created"""
@@ -45,16 +60,15 @@ class ZapierWebhookManager:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(webhook_url, json=payload)
+            response = await self._http.post(webhook_url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+            
+            if response.status_code in [200, 201, 202]:
+                logger.info(f"Successfully triggered Zapier new_affiliate_link webhook")
+                return True
+            else:
+                logger.warning(f"Zapier webhook response: {response.status_code}")
+                return False
                 
-                if response.status_code in [200, 201, 202]:
-                    logger.info(f"Successfully triggered Zapier new_affiliate_link webhook")
-                    return True
-                else:
-                    logger.warning(f"Zapier webhook response: {response.status_code}")
-                    return False
-                    
         except Exception as e:
             logger.error(f"Error triggering Zapier new_affiliate_link webhook: {e}")
             return False
@@ -80,10 +94,9 @@ class ZapierWebhookManager:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(webhook_url, json=payload)
-                return response.status_code in [200, 201, 202]
-                
+            response = await self._http.post(webhook_url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+            return response.status_code in [200, 201, 202]
+            
         except Exception as e:
             logger.error(f"Error triggering Zapier conversion webhook: {e}")
             return False
@@ -110,10 +123,9 @@ class ZapierWebhookManager:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(webhook_url, json=payload)
-                return response.status_code in [200, 201, 202]
-                
+            response = await self._http.post(webhook_url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+            return response.status_code in [200, 201, 202]
+            
         except Exception as e:
             logger.error(f"Error triggering Zapier content webhook: {e}")
             return False
@@ -140,10 +152,9 @@ class ZapierWebhookManager:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(webhook_url, json=payload)
-                return response.status_code in [200, 201, 202]
-                
+            response = await self._http.post(webhook_url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+            return response.status_code in [200, 201, 202]
+            
         except Exception as e:
             logger.error(f"Error triggering Zapier price alert webhook: {e}")
             return False
@@ -170,10 +181,9 @@ class ZapierWebhookManager:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(webhook_url, json=payload)
-                return response.status_code in [200, 201, 202]
-                
+            response = await self._http.post(webhook_url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+            return response.status_code in [200, 201, 202]
+            
         except Exception as e:
             logger.error(f"Error triggering Zapier email campaign webhook: {e}")
             return False
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+
+import orjson
+import pytest
+
+import affiliate_networks
+from affiliate_networks import (
+    AffiliateNetworkManager,
+    CJAffiliateClient,
+    _Uncached,
+    _bucket,
+    async_cached,
+    single_flight,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class _Counter:
+    """Minimal owner for the caching decorators, counting underlying calls"""
+    
+    def __init__(self, results):
+        self._inflight = {}
+        self.calls = 0
+        self._results = list(results)
+    
+    @async_cached(ttl=60, grace=60)
+    @single_flight
+    async def fetch(self, key: str = ''):
+        self.calls += 1
+        await asyncio.sleep(0)
+        result = self._results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _expire(owner, key=''):
+    """Push an owner's cache entry for fetch(key) just past its TTL, inside the grace window"""
+    cache_key = ('fetch', (key,), frozenset())
+    expires_at, value = affiliate_networks._cache[owner][cache_key]
+    affiliate_networks._cache[owner][cache_key] = (expires_at - 61, value)
+
+
+@pytest.mark.parametrize('days, expected', [
+    (1, 1), (2, 7), (7, 7), (8, 14), (28, 30), (30, 30), (31, 60), (90, 90),
+    (91, 91), (365, 365)
+])
+def test_bucket_rounds_up_and_never_shortens(days, expected):
+    assert _bucket(days) == expected
+
+
+def test_cache_hit_returns_independent_copies():
+    owner = _Counter([{'rows': [1, 2], 'meta': {'n': 2}}])
+    
+    async def scenario():
+        first = await owner.fetch('a')
+        first['rows'].append(3)
+        first['meta']['n'] = 99
+        return await owner.fetch('a')
+    
+    assert run(scenario()) == {'rows': [1, 2], 'meta': {'n': 2}}
+    assert owner.calls == 1
+
+
+def test_failures_are_not_cached():
+    owner = _Counter([RuntimeError('down'), _Uncached([]), ['ok']])
+    
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await owner.fetch('a')
+        fallback = await owner.fetch('a')
+        result = await owner.fetch('a')
+        return fallback, result, await owner.fetch('a')
+    
+    assert run(scenario()) == ([], ['ok'], ['ok'])
+    assert owner.calls == 3
+
+
+def test_cache_is_per_instance():
+    first = _Counter([['first']])
+    second = _Counter([['second']])
+    
+    async def scenario():
+        return await first.fetch('a'), await second.fetch('a')
+    
+    assert run(scenario()) == (['first'], ['second'])
+
+
+def test_concurrent_misses_share_one_call():
+    owner = _Counter([['shared']])
+    
+    async def scenario():
+        return await asyncio.gather(*(owner.fetch('a') for _ in range(5)))
+    
+    results = run(scenario())
+    assert results == [['shared']] * 5
+    assert owner.calls == 1
+    assert len({id(result) for result in results}) == 5
+
+
+def test_stale_entry_is_served_while_refreshing():
+    owner = _Counter([['old'], ['new']])
+    
+    async def scenario():
+        await owner.fetch('a')
+        _expire(owner, 'a')
+        stale = await owner.fetch('a')
+        await asyncio.sleep(0.01)
+        return stale, await owner.fetch('a')
+    
+    assert run(scenario()) == (['old'], ['new'])
+    assert owner.calls == 2
+
+
+def test_failed_background_refresh_is_logged_and_keeps_stale_value(caplog):
+    owner = _Counter([['old'], RuntimeError('boom')])
+    
+    async def scenario():
+        await owner.fetch('a')
+        _expire(owner, 'a')
+        await owner.fetch('a')
+        await asyncio.sleep(0.01)
+        return await owner.fetch('a')
+    
+    with caplog.at_level(logging.ERROR, logger='affiliate_networks'):
+        assert run(scenario()) == ['old']
+    assert 'boom' in caplog.text
+
+
+def test_client_commissions_share_a_bucket():
+    client = CJAffiliateClient()
+    
+    async def scenario():
+        commissions = await client.get_commissions(28)
+        commissions.clear()
+        return await client.get_commissions(30)
+    
+    assert len(run(scenario())) == 2
+
+
+def test_mock_aggregate_is_not_shared_between_callers():
+    manager = AffiliateNetworkManager()
+    
+    async def scenario():
+        first = await manager.get_all_commissions(30)
+        first['commissions'].clear()
+        first['network_breakdown']['cj_affiliate'] = 0
+        return await manager.get_all_commissions(30)
+    
+    summary = run(scenario())
+    assert summary['commission_count'] == 6
+    assert len(summary['commissions']) == 6
+    assert summary['network_breakdown'] == {'cj_affiliate': 2, 'shareasale': 2, 'awin': 2}
+    assert summary['total_earnings'] == pytest.approx(45.67 + 75.00 + 89.40 + 25.00 + 67.89 + 120.00)
+    assert summary['confirmed_earnings'] == pytest.approx(45.67 + 89.40 + 25.00 + 67.89)
+
+
+def test_partial_network_failure_is_not_cached(monkeypatch):
+    manager = AffiliateNetworkManager()
+    manager._mock_mode = False
+    
+    async def failing(days):
+        raise RuntimeError('ShareASale down')
+    
+    monkeypatch.setattr(manager.sas_client, 'get_transactions', failing)
+    
+    async def scenario():
+        partial = await manager.get_all_commissions(30)
+        monkeypatch.undo()
+        return partial, await manager.get_all_commissions(30)
+    
+    partial, complete = run(scenario())
+    assert partial['network_breakdown']['shareasale'] == 0
+    assert complete['network_breakdown']['shareasale'] == 2
+
+
+def test_serialized_records_keep_each_networks_key_names():
+    manager = AffiliateNetworkManager()
+    
+    async def scenario():
+        programs = [program.asdict() for program in await manager.search_all_programs()]
+        return programs, orjson.loads(await manager.get_all_commissions_json(30))
+    
+    programs, summary = run(scenario())
+    by_network = {program['network']: program for program in reversed(programs)}
+    assert by_network['CJ Affiliate']['advertiser_id'] == 'cj_123'
+    assert by_network['CJ Affiliate']['program_status'] == 'active'
+    assert by_network['ShareASale']['merchant_id'] == 'sas_789'
+    assert by_network['Awin']['programme_id'] == 'awin_321'
+    assert by_network['Awin']['programme_status'] == 'joined'
+    assert 'program_id' not in by_network['Awin'] and 'status' not in by_network['Awin']
+    
+    commissions = {commission['transaction_id']: commission for commission in summary['commissions']}
+    assert commissions['cj_001']['advertiser'] == 'TechGear Pro'
+    assert commissions['sas_001']['merchant'] == 'SaaS Startup Tools'
+    assert 'advertiser' not in commissions['sas_001']
+    assert all('network' not in commission for commission in summary['commissions'])
@@ -0,0 +1,181 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import gearit_client
+from gearit_client import GEARitClient, _CategoryCache, _merge_products, _parse_prices, _rakuten_deep_link
+
+
+class _Response:
+    def __init__(self, status, body=b'', headers=None):
+        self.status = status
+        self.charset = 'utf-8'
+        self.headers = headers or {}
+        self._body = body
+    
+    async def read(self):
+        return self._body
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    """Serves queued responses and records the request headers"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+    
+    def get(self, url, headers=None):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+_PAGE = (
+    b'<div class="product-card"><a class="product-title" href="/products/hub">USB Hub</a>'
+    b'<span class="price">$19.99</span></div>'
+)
+
+
+def _cards(*paths):
+    return ''.join(
+        f'<div class="product-card"><a class="product-title" href="{path}">Hub {index}</a>'
+        f'<span class="price">${index}9.99</span></div>'
+        for index, path in enumerate(paths)
+    )
+
+
+def _ldjson(payload):
+    return f'<script type="application/ld+json">{payload}</script>'
+
+
+def _scrape(html, max_products=50):
+    """Run the page-level JSON-LD/DOM selection the category scraper uses"""
+    client = GEARitClient()
+    products, listed = client._extract_ldjson_products(html.encode(), 'usb-hubs', 'now', max_products)
+    if not listed and len(products) < max_products:
+        products = _merge_products(
+            products,
+            client._extract_dom_products(html.encode(), 'usb-hubs', 'now', max_products),
+            max_products
+        )
+    return products
+
+
+def _scrape_twice(monkeypatch, tmp_path, session, first_at, second_at, before_second=None):
+    monkeypatch.setattr(gearit_client, '_category_cache', _CategoryCache(tmp_path))
+    monkeypatch.setattr(GEARitClient, 'session', session)
+    client = GEARitClient()
+    
+    async def scenario():
+        first = await client.get_category_products('usb-hubs', 10, first_at)
+        if before_second:
+            await asyncio.to_thread(before_second)
+        return first, await client.get_category_products('usb-hubs', 10, second_at)
+    
+    return asyncio.run(scenario())
+
+
+def test_not_modified_serves_cached_products_with_a_fresh_timestamp(monkeypatch, tmp_path):
+    session = _Session(_Response(200, _PAGE, {'ETag': '"v1"'}), _Response(304))
+    
+    first, second = _scrape_twice(monkeypatch, tmp_path, session, 'monday', 'tuesday')
+    
+    assert session.sent_headers[1] == {'If-None-Match': '"v1"'}
+    assert [product.name for product in second] == [product.name for product in first] == ['USB Hub']
+    assert first[0].scraped_at == 'monday'
+    assert second[0].scraped_at == 'tuesday'
+
+
+def test_cache_entry_from_another_schema_is_a_miss(monkeypatch, tmp_path):
+    session = _Session(_Response(200, _PAGE, {'ETag': '"v1"'}), _Response(200, _PAGE, {'ETag': '"v1"'}))
+    cache = _CategoryCache(tmp_path)
+    
+    def add_unknown_field():
+        url = 'https://www.gearit.com/collections/usb-hubs'
+        entry = cache._read(url)
+        entry['products'][0]['legacy_field'] = 1
+        cache._write(url, entry)
+    
+    first, second = _scrape_twice(monkeypatch, tmp_path, session, 'monday', 'tuesday', add_unknown_field)
+    
+    assert session.sent_headers[1] == {}
+    assert [product.name for product in second] == ['USB Hub']
+    assert second[0].scraped_at == 'tuesday'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('$24.99', ['24.99']),
+    ('24', ['24']),
+    ('$24.99 $34.99', ['24.99', '34.99']),
+    ('Sale price $1,299.00', ['1299.00']),
+    ('$2\u00b2', ['2']),
+    ('Sold out', []),
+])
+def test_parse_prices(text, expected):
+    assert _parse_prices(text) == expected
+
+
+def test_deep_link_encodes_product_url():
+    url = 'https://www.gearit.com/products/hub?variant=1&ref=a#reviews'
+    link = _rakuten_deep_link(url, 'SID1')
+    
+    assert link.startswith('https://click.linksynergy.com/deeplink?id=SID1&mid=12345&murl=')
+    assert parse_qs(urlsplit(link).query) == {'id': ['SID1'], 'mid': ['12345'], 'murl': [url]}
+    assert 'u1=' not in link
+
+
+def test_deep_link_passes_non_gearit_urls_through():
+    assert _rakuten_deep_link('https://example.com/item') == 'https://example.com/item'
+    assert _rakuten_deep_link('') == ''
+
+
+def test_featured_ldjson_product_does_not_hide_the_grid():
+    featured = _ldjson('{"@type": ["Product", "Thing"], "name": "Featured Hub", '
+                       '"url": "/products/p1", "offers": {"price": "5.00"}}')
+    html = f'<html><head>{featured}</head><body>{_cards("/products/p0", "/products/p1", "/products/p2")}</body></html>'
+    
+    products = _scrape(html)
+    
+    assert [(product.name, product.price) for product in products] == [
+        ('Hub 0', 9.99), ('Featured Hub', 5.0), ('Hub 2', 29.99)
+    ]
+
+
+def test_ldjson_item_list_replaces_the_dom_walk():
+    item_list = _ldjson(
+        '{"@type": "ItemList", "itemListElement": ['
+        '{"item": {"@type": "Product", "name": "A", "url": "/products/a", "offers": {"price": "1"}}},'
+        '{"item": {"@type": "Product", "name": "B", "url": "/products/b", "offers": [{"price": "2"}]}}]}'
+    )
+    html = f'<html><head>{item_list}</head><body>{_cards("/products/other")}</body></html>'
+    
+    assert [(product.name, product.price) for product in _scrape(html)] == [('A', 1.0), ('B', 2.0)]
+
+
+def test_invalid_ldjson_falls_back_to_the_dom():
+    html = f'<html><head>{_ldjson("{not json")}</head><body>{_cards("/products/p0")}</body></html>'
+    
+    assert [product.name for product in _scrape(html)] == ['Hub 0']
+
+
+def test_sample_products_are_fresh_per_call():
+    client = GEARitClient()
+    
+    async def scenario():
+        first = await client.get_sample_products()
+        first[0].features.append('mutated')
+        await asyncio.sleep(0.001)
+        return first, await client.get_sample_products()
+    
+    first, second = asyncio.run(scenario())
+    
+    assert len(second) == len(first) == 8
+    assert first[0] is not second[0]
+    assert 'mutated' not in second[0].features
+    assert second[0].scraped_at > first[0].scraped_at
@@ -0,0 +1,57 @@
+import pytest
+
+import google_analytics
+from google_analytics import _get_cached_report, _store_report
+
+
+@pytest.fixture(autouse=True)
+def _empty_report_cache(monkeypatch):
+    monkeypatch.setattr(google_analytics, '_report_cache', {})
+
+
+def test_cached_report_is_a_copy_without_cache_metadata():
+    report = {'total_clicks': 10, 'top_performing_links': [{'link': 'hub', 'clicks': 10}]}
+    _store_report(('performance', 'p1'), 60, report)
+    report['top_performing_links'].append({'link': 'added after caching'})
+    
+    cached = _get_cached_report(('performance', 'p1'))
+    cached['total_clicks'] = 0
+    cached['top_performing_links'][0]['clicks'] = 0
+    cached['top_performing_links'].clear()
+    
+    assert _get_cached_report(('performance', 'p1')) == {
+        'total_clicks': 10, 'top_performing_links': [{'link': 'hub', 'clicks': 10}]
+    }
+
+
+def test_expired_report_is_dropped(monkeypatch):
+    _store_report(('realtime', 'p1'), 30, {'active_users': 3})
+    now = google_analytics.time.monotonic()
+    monkeypatch.setattr(google_analytics.time, 'monotonic', lambda: now + 31)
+    
+    assert _get_cached_report(('realtime', 'p1')) is None
+    assert google_analytics._report_cache == {}
+
+
+def test_report_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(google_analytics, 'REPORT_CACHE_MAX_ENTRIES', 2)
+    for index in range(3):
+        _store_report(('performance', index), 60, {'index': index})
+    
+    assert _get_cached_report(('performance', 0)) is None
+    assert _get_cached_report(('performance', 2)) == {'index': 2}
+
+
+def test_mock_reports_do_not_share_the_constants():
+    service = google_analytics.GoogleAnalyticsService()
+    
+    performance = service._get_mock_performance_data()
+    performance['top_performing_links'][0]['clicks'] = 0
+    performance['daily_breakdown'].clear()
+    realtime = service._get_mock_realtime_data()
+    realtime['top_events'][0]['count'] = 0
+    
+    assert service._get_mock_performance_data() == google_analytics._MOCK_PERFORMANCE
+    assert google_analytics._MOCK_PERFORMANCE['top_performing_links'][0]['clicks'] == 234
+    assert len(google_analytics._MOCK_PERFORMANCE['daily_breakdown']) == 5
+    assert google_analytics._MOCK_REALTIME['top_events'][0]['count'] == 12
@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import httpx
+import orjson
+import pytest
+
+import rakuten_client
+from rakuten_client import RakutenAPIClient, _HttpxTransport, _parse_price
+
+
+XML_RESPONSE = b'''<?xml version="1.0" encoding="UTF-8"?>
+<result><TotalMatches>2</TotalMatches><TotalPages>1</TotalPages><PageNumber>1</PageNumber>
+<item><mid>1</mid><merchantname>GEARit</merchantname><linkid>111</linkid><sku>S1</sku>
+<productname>USB Hub</productname><category><primary>Electronics</primary></category>
+<price currency="USD">39.99</price><saleprice currency="USD">29.99</saleprice>
+<description><short>Nice hub</short><long>long</long></description><keywords>usb,hub</keywords>
+<linkurl>https://click/1</linkurl><imageurl>https://img/1</imageurl></item>
+<item><linkid>222</linkid><productname>Cable</productname><price currency="USD">9.50</price>
+<linkurl>https://click/2</linkurl></item></result>'''
+
+JSON_RESPONSE = orjson.dumps({
+    'TotalMatches': 2,
+    'item': [
+        {
+            'linkid': '111', 'merchantname': 'GEARit', 'sku': 'S1', 'productname': 'USB Hub',
+            'category': {'primary': 'Electronics'}, 'price': {'@currency': 'USD', '#text': '39.99'},
+            'saleprice': 29.99, 'description': {'short': 'Nice hub'}, 'keywords': 'usb,hub',
+            'linkurl': 'https://click/1', 'imageurl': 'https://img/1'
+        },
+        {'linkid': '222', 'productname': 'Cable', 'price': '9.50', 'linkurl': 'https://click/2'}
+    ]
+})
+
+EXPECTED_PRODUCTS = [
+    {
+        'id': '111', 'name': 'USB Hub', 'description': 'Nice hub', 'price': 29.99,
+        'original_price': 39.99, 'image_url': 'https://img/1', 'affiliate_url': 'https://click/1',
+        'retailer': 'Rakuten', 'category': 'Electronics', 'rating': 0.0, 'source': 'rakuten',
+        'tags': ['usb', 'hub']
+    },
+    {
+        'id': '222', 'name': 'Cable', 'description': '', 'price': 9.5, 'original_price': 9.5,
+        'image_url': '', 'affiliate_url': 'https://click/2', 'retailer': 'Rakuten',
+        'category': 'General', 'rating': 0.0, 'source': 'rakuten', 'tags': []
+    }
+]
+
+
+def _client(handler) -> RakutenAPIClient:
+    """Client whose HTTP calls are answered in-process by `handler`"""
+    client = RakutenAPIClient()
+    client._transport = _HttpxTransport()
+    client._transport._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _run(client, coro_factory):
+    async def scenario():
+        try:
+            return await coro_factory()
+        finally:
+            await client.close()
+    
+    return asyncio.run(scenario())
+
+
+def test_mock_data_does_not_share_the_constants():
+    client = RakutenAPIClient()
+    
+    products = client._get_mock_products('usb')
+    products[0]['tags'].append('mutated')
+    products[0]['name'] = 'mutated'
+    coupons = client._get_mock_coupons()
+    coupons[0]['code'] = 'HACK'
+    
+    assert client._get_mock_products('usb')[0]['tags'] == ['usb', 'hub', 'electronics', 'power']
+    assert rakuten_client._MOCK_PRODUCTS[0]['tags'] == ['usb', 'hub', 'electronics', 'power']
+    assert client._get_mock_products('usb')[0]['name'] == rakuten_client._MOCK_PRODUCTS[0]['name']
+    assert rakuten_client._MOCK_COUPONS[0]['code'] == client._get_mock_coupons()[0]['code'] != 'HACK'
+
+
+def test_unmatched_keyword_falls_back_to_the_first_two_mock_products():
+    products = RakutenAPIClient()._get_mock_products('no such product')
+    
+    assert [product['id'] for product in products] == ['rakuten_usb_hub', 'rakuten_wireless_mouse']
+
+
+def test_search_many_paces_searches_and_isolates_failures(monkeypatch):
+    monkeypatch.setattr(rakuten_client, 'SEARCH_REQUESTS_PER_SECOND', 20)
+    client = RakutenAPIClient()
+    started = []
+    
+    async def search_products(keyword, category=None, max_results=20):
+        started.append(time.monotonic())
+        if keyword == 'broken':
+            raise RuntimeError('quota exceeded')
+        return [{'id': keyword}]
+    
+    monkeypatch.setattr(client, 'search_products', search_products)
+    
+    results = asyncio.run(client.search_products_many(['hub', 'broken', 'cable']))
+    
+    assert results[0] == [{'id': 'hub'}]
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == [{'id': 'cable'}]
+    assert all(later - earlier >= 0.045 for earlier, later in zip(started, started[1:]))
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('29.99', 29.99),
+    ('$1,299.50 USD', 1299.5),
+    ('USD 12', 12.0),
+    ('.5', 0.5),
+    ('', 0.0),
+    (None, 0.0),
+    ('n/a', 0.0),
+])
+def test_parse_price(text, expected):
+    assert _parse_price(text) == expected
+
+
+def test_search_products_parses_streamed_xml(monkeypatch):
+    # Tiny chunks so elements straddle chunk boundaries
+    monkeypatch.setattr(rakuten_client, 'XML_CHUNK_SIZE', 7)
+    
+    class ChunkedStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for start in range(0, len(XML_RESPONSE), 7):
+                yield XML_RESPONSE[start:start + 7]
+    
+    client = _client(lambda request: httpx.Response(200, stream=ChunkedStream()))
+    
+    assert _run(client, lambda: client.search_products('usb')) == EXPECTED_PRODUCTS
+
+
+def test_search_products_parses_json():
+    client = _client(lambda request: httpx.Response(
+        200, content=JSON_RESPONSE, headers={'content-type': 'application/json'}
+    ))
+    
+    assert _run(client, lambda: client.search_products('usb')) == EXPECTED_PRODUCTS
+
+
+def test_malformed_xml_falls_back_to_mock_products():
+    client = _client(lambda request: httpx.Response(200, content=b'<result><item><linkid>1</item>'))
+    
+    products = _run(client, lambda: client.search_products('usb'))
+    
+    assert products == client._get_mock_products('usb')
+
+
+def test_transform_cache_sees_mutated_items():
+    client = RakutenAPIClient()
+    item = {'productId': 'p1', 'productName': 'Hub', 'price': '5'}
+    
+    first = client._transform_product(item)
+    first['tags'].append('mutated')
+    item['price'] = '7'
+    second = client._transform_product(item)
+    
+    assert first['price'] == 5.0
+    assert second['price'] == 7.0
+    assert client._transform_product(dict(item)) == second
+    assert second['tags'] == []
+
+
+class _CouponServer:
+    """Coupon endpoint that serves an ETag and answers matching revalidations with 304"""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def __call__(self, request):
+        self.requests.append(request.headers.get('if-none-match'))
+        if request.headers.get('if-none-match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content=orjson.dumps({'coupons': [{'couponId': 'c1', 'couponName': '10% off'}]}),
+            headers={'ETag': '"v1"'}
+        )
+
+
+def test_get_coupons_revalidates_with_etag():
+    server = _CouponServer()
+    client = _client(server)
+    
+    async def scenario():
+        first = await client.get_coupons()
+        first[0]['title'] = 'mutated'
+        return first, await client.get_coupons()
+    
+    first, second = _run(client, scenario)
+    
+    assert server.requests == [None, '"v1"']
+    assert second == [{
+        'id': 'c1', 'advertiser': '', 'title': '10% off', 'description': '',
+        'code': '', 'discount': '', 'expires': '', 'category': ''
+    }]
+
+
+def test_concurrent_get_coupons_share_one_request():
+    server = _CouponServer()
+    client = _client(server)
+    
+    async def scenario():
+        return await asyncio.gather(*(client.get_coupons() for _ in range(5)))
+    
+    results = _run(client, scenario)
+    
+    assert server.requests == [None]
+    assert all(result == results[0] for result in results)
+    assert len({id(result[0]) for result in results}) == 5
+    assert client._coupon_fetches == {}